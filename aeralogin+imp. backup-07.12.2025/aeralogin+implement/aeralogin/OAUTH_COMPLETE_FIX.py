@@ -16,6 +16,143 @@ LINES TO REPLACE: 3660-3760 (oauth_complete function)
 # PASTE THIS CODE INTO server.py at line 3660
 # ========================================
 
+# ========================================
+# FAST EOA RECOVERY (libsecp256k1 via coincurve)
+# ========================================
+try:
+    import coincurve
+    from eth_utils import keccak
+    COINCURVE_AVAILABLE = True
+except ImportError:
+    COINCURVE_AVAILABLE = False
+
+
+def recover_personal_sign_address(message: str, message_hash: bytes, sig_bytes: bytes) -> str:
+    """
+    Recover the signer of an EIP-191 personal_sign message (lowercase address).
+    
+    Uses libsecp256k1 directly through coincurve for 65-byte signatures,
+    falls back to eth_account if coincurve is not installed.
+    """
+    if COINCURVE_AVAILABLE and len(sig_bytes) == 65:
+        # coincurve expects r || s || recovery_id (0/1), Ethereum sends v = 27/28
+        v = sig_bytes[64]
+        recoverable_sig = sig_bytes[:64] + bytes([v - 27 if v >= 27 else v])
+        public_key = coincurve.PublicKey.from_signature_and_message(
+            recoverable_sig, message_hash, hasher=None
+        )
+        return "0x" + keccak(public_key.format(compressed=False)[1:])[-20:].hex()
+    
+    from eth_account.messages import encode_defunct
+    from eth_account import Account
+    return Account.recover_message(encode_defunct(text=message), signature=sig_bytes).lower()
+
+
+# ========================================
+# EIP-1271 HELPERS (shared provider + result cache)
+# ========================================
+from web3 import Web3
+from cachetools import TTLCache
+
+# Shared BASE mainnet provider - reuses the keep-alive HTTP session
+_eip1271_w3 = Web3(Web3.HTTPProvider('https://mainnet.base.org', request_kwargs={'timeout': 5}))
+
+# EIP-1271 magic value for valid signature (= isValidSignature(bytes32,bytes) selector)
+EIP1271_MAGIC_VALUE = bytes.fromhex('1626ba7e')
+EIP1271_SELECTOR = EIP1271_MAGIC_VALUE
+
+# ABI head for isValidSignature: offset of the dynamic `bytes` argument
+_EIP1271_SIG_OFFSET = (0x40).to_bytes(32, "big")
+
+# Checksum address per wallet (computed once)
+_EIP1271_CHECKSUM_CACHE: dict = {}
+
+# (address, message_hash, signature) -> isValidSignature result (replay dedup)
+_EIP1271_RESULT_CACHE = TTLCache(maxsize=1024, ttl=300)
+
+
+def encode_is_valid_signature_call(message_hash: bytes, sig_bytes: bytes) -> bytes:
+    """
+    Hand-encoded calldata for isValidSignature(bytes32 _hash, bytes _signature):
+    selector | hash | offset(0x40) | len(signature) | signature (zero-padded to 32)
+    """
+    return (
+        EIP1271_SELECTOR
+        + message_hash
+        + _EIP1271_SIG_OFFSET
+        + len(sig_bytes).to_bytes(32, "big")
+        + sig_bytes
+        + b"\x00" * (-len(sig_bytes) % 32)
+    )
+
+
+def call_eip1271_is_valid_signature(address: str, message_hash: bytes, sig_bytes: bytes) -> bytes:
+    """
+    Call isValidSignature on a smart contract wallet, cached for 5 minutes.
+    Returns the bytes4 result. Raises on RPC/contract errors (errors are not cached).
+    """
+    cache_key = (address, message_hash.hex(), sig_bytes)
+    result = _EIP1271_RESULT_CACHE.get(cache_key)
+    if result is not None:
+        return result
+    
+    checksum_address = _EIP1271_CHECKSUM_CACHE.get(address)
+    if checksum_address is None:
+        checksum_address = Web3.to_checksum_address(address)
+        _EIP1271_CHECKSUM_CACHE[address] = checksum_address
+    
+    raw = _eip1271_w3.eth.call({
+        "to": checksum_address,
+        "data": "0x" + encode_is_valid_signature_call(message_hash, sig_bytes).hex()
+    })
+    # bytes4 return value is left-aligned in a 32-byte word
+    result = bytes(raw[:4])
+    _EIP1271_RESULT_CACHE[cache_key] = result
+    return result
+
+
+# ========================================
+# OAUTH DB HELPERS (per-thread connection + static SQL)
+# ========================================
+import threading
+
+_oauth_db_local = threading.local()
+
+# Pending authorization + client requirements + user in one round-trip
+OAUTH_PENDING_SQL = """
+    SELECT oc.*, c.min_score, c.require_nft,
+           u.address AS user_address, u.identity_status, u.score
+    FROM oauth_codes oc
+    JOIN oauth_clients c ON oc.client_id = c.client_id
+    LEFT JOIN users u ON u.address = ?
+    WHERE oc.nonce = ? AND oc.used = 0 AND oc.expires_at > ?
+"""
+
+OAUTH_CODE_UPDATE_SQL = """
+    UPDATE oauth_codes 
+    SET code = ?, address = ?, created_at = ?, expires_at = ?
+    WHERE nonce = ?
+"""
+
+
+def get_oauth_db_connection():
+    """
+    Persistent connection per worker thread for the OAuth hot path.
+    sqlite3 keeps its statement cache per connection, so the static SQL
+    above is only parsed once per thread. Never close this connection.
+    """
+    conn = getattr(_oauth_db_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size = -20000")  # 20MB Cache
+        conn.execute("PRAGMA busy_timeout=10000")  # 10s Timeout
+        _oauth_db_local.conn = conn
+    return conn
+
+
 @app.post("/oauth/complete")
 async def oauth_complete(req: Request):
     """
@@ -49,19 +186,14 @@ async def oauth_complete(req: Request):
         if not all([oauth_nonce, address, nonce, message, signature]):
             return {"success": False, "error": "Missing required parameters"}
         
-        # Find pending authorization
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT oc.*, c.min_score, c.require_nft 
-            FROM oauth_codes oc
-            JOIN oauth_clients c ON oc.client_id = c.client_id
-            WHERE oc.nonce = ? AND oc.used = 0 AND oc.expires_at > ?
-        """, (oauth_nonce, datetime.now(timezone.utc).isoformat()))
-        pending = cursor.fetchone()
+        # Find pending authorization (incl. client requirements + user)
+        conn = get_oauth_db_connection()
+        pending = conn.execute(
+            OAUTH_PENDING_SQL,
+            (address, oauth_nonce, datetime.now(timezone.utc).isoformat())
+        ).fetchone()
         
         if not pending:
-            conn.close()
             return {"success": False, "error": "Invalid or expired authorization request"}
         
         # ========================================
@@ -74,74 +206,44 @@ async def oauth_complete(req: Request):
         # These signatures are much longer than 65 bytes
         is_smart_wallet_sig = len(signature) > 200 if signature else False
         
-        log_activity("INFO", "OAUTH", f"Signature verification start", 
+        log_activity("INFO", "OAUTH", "Signature verification start", 
                     address=address[:10],
                     sig_length=len(signature) if signature else 0,
                     is_smart_wallet=is_smart_wallet_sig)
         
         try:
-            from eth_account.messages import encode_defunct, defunct_hash_message
-            from eth_account import Account
+            from eth_account.messages import defunct_hash_message
+            
+            # Hash the message once (EIP-191 personal sign format),
+            # shared by the EIP-1271 and EOA paths
+            message_hash = defunct_hash_message(text=message)
+            
+            # Decode the signature once (smart wallet sigs reach 600+ bytes)
+            sig_bytes = bytes.fromhex(signature[2:] if signature.startswith('0x') else signature)
             
             # ========================================
             # SMART CONTRACT WALLET (EIP-1271) VERIFICATION
             # Coinbase Smart Wallet, Safe, Base Wallet, etc.
             # ========================================
             if is_smart_wallet_sig and message and nonce in message:
-                log_activity("INFO", "OAUTH", f"Attempting EIP-1271 Smart Contract Wallet verification...")
+                log_activity("INFO", "OAUTH", "Attempting EIP-1271 Smart Contract Wallet verification...")
                 try:
-                    from web3 import Web3
-                    
-                    # Connect to BASE mainnet
-                    w3 = Web3(Web3.HTTPProvider('https://mainnet.base.org'))
-                    
-                    # EIP-1271 ABI - just the isValidSignature function
-                    EIP1271_ABI = [
-                        {
-                            "inputs": [
-                                {"name": "_hash", "type": "bytes32"},
-                                {"name": "_signature", "type": "bytes"}
-                            ],
-                            "name": "isValidSignature",
-                            "outputs": [{"name": "", "type": "bytes4"}],
-                            "stateMutability": "view",
-                            "type": "function"
-                        }
-                    ]
-                    
-                    # Hash the message (EIP-191 personal sign format)
-                    message_hash = defunct_hash_message(text=message)
-                    log_activity("INFO", "OAUTH", f"Message hash: {message_hash.hex()[:20]}...")
-                    
-                    # Create contract instance
-                    wallet_contract = w3.eth.contract(
-                        address=Web3.to_checksum_address(address),
-                        abi=EIP1271_ABI
-                    )
-                    
-                    # Convert signature to bytes
-                    sig_bytes = bytes.fromhex(signature[2:]) if signature.startswith('0x') else bytes.fromhex(signature)
+                    log_activity("INFO", "OAUTH", "Message hash: %s...", message_hash.hex()[:20])
                     
                     # Call isValidSignature on the smart contract wallet
                     try:
-                        result = wallet_contract.functions.isValidSignature(
-                            message_hash,
-                            sig_bytes
-                        ).call()
-                        
-                        # EIP-1271 magic value for valid signature
-                        MAGIC_VALUE = bytes.fromhex('1626ba7e')
+                        result = call_eip1271_is_valid_signature(address, message_hash, sig_bytes)
                         
-                        if result == MAGIC_VALUE:
+                        if result == EIP1271_MAGIC_VALUE:
                             signature_valid = True
-                            log_activity("INFO", "OAUTH", f"✅ EIP-1271 Smart Contract Wallet verification SUCCESS!")
+                            log_activity("INFO", "OAUTH", "✅ EIP-1271 Smart Contract Wallet verification SUCCESS!")
                         else:
-                            log_activity("INFO", "OAUTH", f"EIP-1271 returned: {result.hex()} (expected 1626ba7e)")
+                            log_activity("INFO", "OAUTH", "EIP-1271 returned: %s (expected 1626ba7e)", result.hex())
                     except Exception as contract_error:
-                        log_activity("INFO", "OAUTH", f"EIP-1271 contract call failed: {str(contract_error)}")
+                        log_activity("INFO", "OAUTH", "EIP-1271 contract call failed: %s", contract_error)
                         
                 except Exception as eip1271_error:
-                    log_activity("INFO", "OAUTH", f"EIP-1271 verification error: {str(eip1271_error)}")
+                    log_activity("INFO", "OAUTH", "EIP-1271 verification error: %s", eip1271_error)
             
             # ========================================
             # STANDARD EOA SIGNATURE VERIFICATION
@@ -151,63 +253,49 @@ async def oauth_complete(req: Request):
                 # If frontend sent the message, use it directly
                 if message and nonce in message:
                     try:
-                        msg = encode_defunct(text=message)
-                        recovered = Account.recover_message(msg, signature=signature)
+                        recovered = recover_personal_sign_address(message, message_hash, sig_bytes)
                         
-                        if recovered.lower() == address:
+                        if recovered == address:
                             signature_valid = True
-                            log_activity("INFO", "OAUTH", f"✅ EOA signature verification SUCCESS")
+                            log_activity("INFO", "OAUTH", "✅ EOA signature verification SUCCESS")
                         else:
-                            log_activity("ERROR", "OAUTH", f"Signature verification FAILED", 
+                            log_activity("ERROR", "OAUTH", "Signature verification FAILED", 
                                        address=address[:10], 
                                        recovered=recovered[:10])
                     except Exception as e:
-                        log_activity("ERROR", "OAUTH", f"EOA verification error: {str(e)}")
+                        log_activity("ERROR", "OAUTH", "EOA verification error: %s", e)
             
             if not signature_valid:
-                conn.close()
                 return {"success": False, "error": "Signature verification failed - wallet signature invalid"}
             
             # 🔐 SIWE: Also verify nonce is in the message (anti-replay)
             if message and nonce not in message:
-                conn.close()
                 log_activity("ERROR", "OAUTH", "SIWE nonce mismatch", address=address[:10])
                 return {"success": False, "error": "Nonce mismatch in SIWE message"}
                 
         except Exception as e:
-            conn.close()
-            log_activity("ERROR", "OAUTH", f"Signature verification error: {str(e)}", address=address[:10])
+            log_activity("ERROR", "OAUTH", "Signature verification error: %s", e, address=address[:10])
             return {"success": False, "error": f"Signature error: {str(e)}"}
         
-        # Check user exists and meets requirements
-        cursor.execute("SELECT * FROM users WHERE address = ?", (address,))
-        user = cursor.fetchone()
-        
-        if not user:
+        # Check user exists and meets requirements (joined into pending)
+        if pending['user_address'] is None:
             # Create user if doesn't exist (triggers NFT minting)
-            conn.close()
             return {"success": False, "error": "Please register on AEraLogIn dashboard first to get your Identity NFT"}
         
         # Check NFT requirement (using identity_status from users table)
         if pending['require_nft']:
-            if user['identity_status'] != 'active':
-                conn.close()
+            if pending['identity_status'] != 'active':
                 return {"success": False, "error": "Identity NFT required. Please mint your NFT on the dashboard first."}
         
         # Check score requirement
-        if user['score'] < pending['min_score']:
-            conn.close()
-            return {"success": False, "error": f"Minimum Resonance Score of {pending['min_score']} required. Your score: {user['score']}"}
+        if pending['score'] < pending['min_score']:
+            return {"success": False, "error": f"Minimum Resonance Score of {pending['min_score']} required. Your score: {pending['score']}"}
         
         # Generate authorization code
         auth_code = generate_oauth_code()
         
         # Update the authorization record with actual data
-        cursor.execute("""
-            UPDATE oauth_codes 
-            SET code = ?, address = ?, created_at = ?, expires_at = ?
-            WHERE nonce = ?
-        """, (
+        conn.execute(OAUTH_CODE_UPDATE_SQL, (
             auth_code,
             address,
             datetime.now(timezone.utc).isoformat(),
@@ -215,14 +303,15 @@ async def oauth_complete(req: Request):
             oauth_nonce
         ))
         conn.commit()
-        conn.close()
         
-        log_activity("INFO", "OAUTH", f"✅ Authorization code generated for {address[:10]}", client_id=pending['client_id'])
+        log_activity("INFO", "OAUTH", "✅ Authorization code generated for %s", address[:10], client_id=pending['client_id'])
         
         return {"success": True, "code": auth_code}
         
     except Exception as e:
-        log_activity("ERROR", "OAUTH", f"OAuth complete error: {str(e)}")
+        if 'conn' in locals():
+            conn.rollback()  # Persistent connection: keine offene Transaktion zurücklassen
+        log_activity("ERROR", "OAUTH", "OAuth complete error: %s", e)
         return {"success": False, "error": "Internal server error"}
 
 
@@ -6,8 +6,12 @@ Uses Backend Wallet (current admin) to grant the role
 import os
 from web3 import Web3
 from eth_account import Account
+from eth_abi import encode as abi_encode
 from dotenv import load_dotenv
-import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv()
@@ -31,159 +35,291 @@ REGISTRY = os.getenv("REGISTRY_ADDRESS")
 # Role hash
 DEFAULT_ADMIN_ROLE = "0x0000000000000000000000000000000000000000000000000000000000000000"
 
-# Initialize Web3
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
-account = Account.from_key(BACKEND_PRIVATE_KEY)
+# Initialize Web3 - one pooled keep-alive session for web3 + batch requests
+# (POST retries are safe here: reads are idempotent, a re-sent raw tx is "already known")
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504], allowed_methods=None)
+))
+w3 = Web3(Web3.HTTPProvider(RPC_URL, session=session))
 
-print("=" * 80)
-print("🔐 ADD SAFE WALLET AS ADMIN - BASE MAINNET")
-print("=" * 80)
-print(f"\n📍 Network: BASE Mainnet (Chain ID: {CHAIN_ID})")
-print(f"🤖 Backend Wallet (Current Admin): {BACKEND_ADDRESS}")
-print(f"🔐 Safe Wallet (New Admin): {SAFE_WALLET}")
-print(f"\n💰 Backend Balance: {w3.from_wei(w3.eth.get_balance(BACKEND_ADDRESS), 'ether'):.6f} ETH")
-
-# Minimal ABI for AccessControl
-ACCESS_CONTROL_ABI = [
-    {
-        "inputs": [{"name": "role", "type": "bytes32"}, {"name": "account", "type": "address"}],
-        "name": "grantRole",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    },
+# Multicall3 (same address on BASE Mainnet + BASE Sepolia)
+MULTICALL3_BASE = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
     {
-        "inputs": [{"name": "role", "type": "bytes32"}, {"name": "account", "type": "address"}],
-        "name": "hasRole",
-        "outputs": [{"name": "", "type": "bool"}],
-        "stateMutability": "view",
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
         "type": "function"
     }
 ]
 
-def grant_admin_role(contract_address, contract_name):
-    """Grant DEFAULT_ADMIN_ROLE to Safe Wallet"""
+CONTRACTS = [
+    ("AEraIdentityNFT", IDENTITY_NFT),
+    ("AEraResonanceScore", RESONANCE_SCORE),
+    ("AEraResonanceRegistry", REGISTRY),
+]
+
+# (role, account) arguments are the same for every contract - encode the calldata once
+ROLE_ARGS = abi_encode(
+    ["bytes32", "address"],
+    [bytes.fromhex(DEFAULT_ADMIN_ROLE[2:]), Web3.to_checksum_address(SAFE_WALLET)]
+)
+GRANTROLE_DATA = Web3.keccak(text="grantRole(bytes32,address)")[:4] + ROLE_ARGS
+HAS_ROLE_DATA = Web3.keccak(text="hasRole(bytes32,address)")[:4] + ROLE_ARGS
+
+def rpc_batch(calls, raise_errors=True):
+    """
+    Send several JSON-RPC calls in ONE HTTP POST
+    calls: [(method, params), ...] - results come back in the same order
+    raise_errors=False: failed calls return a RuntimeError instead of raising
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = session.post(RPC_URL, json=payload, timeout=30)
+    response.raise_for_status()
+    
+    # Node may answer in any order - match by id
+    by_id = {item["id"]: item for item in response.json()}
+    results = []
+    for i, (method, _) in enumerate(calls):
+        item = by_id.get(i, {"error": "missing response"})
+        if "error" in item:
+            error = RuntimeError(f"{method}: {item['error']}")
+            if raise_errors:
+                raise error
+            results.append(error)
+        else:
+            results.append(item["result"])
+    return results
+
+def fetch_prechecks():
+    """
+    Everything the script needs from the node in a single batch:
+    balance, chain id, gas price, nonce + hasRole for all contracts (one Multicall3 eth_call)
+    """
+    # hasRole calldata is identical for every contract, only the target differs
+    multicall = w3.eth.contract(address=MULTICALL3_BASE, abi=MULTICALL3_ABI)
+    aggregate_data = multicall.encodeABI(fn_name="aggregate3", args=[[
+        (Web3.to_checksum_address(contract_address), False, HAS_ROLE_DATA)
+        for _, contract_address in CONTRACTS
+    ]])
+    
+    balance, chain_id, gas_price, nonce, aggregate_result = rpc_batch([
+        ("eth_getBalance", [BACKEND_ADDRESS, "latest"]),
+        ("eth_chainId", []),
+        ("eth_gasPrice", []),
+        ("eth_getTransactionCount", [BACKEND_ADDRESS, "pending"]),
+        ("eth_call", [{"to": MULTICALL3_BASE, "data": aggregate_data}, "latest"]),
+    ])
+    
+    (call_results,) = w3.codec.decode(["(bool,bytes)[]"], Web3.to_bytes(hexstr=aggregate_result))
+    has_roles = [w3.codec.decode(["bool"], return_data)[0] for _, return_data in call_results]
+    return {
+        "balance": int(balance, 16),
+        "chain_id": int(chain_id, 16),
+        "gas_price": int(gas_price, 16),
+        "nonce": int(nonce, 16),
+        "has_roles": has_roles,
+    }
+
+def grant_admin_role(account, contract_address, contract_name, nonce, gas_price):
+    """Build + sign grantRole tx locally (no RPC) - returns raw tx bytes"""
     print(f"\n{'='*80}")
     print(f"📋 Contract: {contract_name}")
     print(f"   Address: {contract_address}")
     print(f"{'='*80}")
     
+    print(f"🔄 Granting DEFAULT_ADMIN_ROLE to Safe Wallet (nonce {nonce})...")
+    
+    # Plain tx dict with the precomputed calldata - only 'to' and nonce differ per contract
+    tx = {
+        'to': Web3.to_checksum_address(contract_address),
+        'data': GRANTROLE_DATA,
+        'value': 0,
+        'nonce': nonce,
+        'gas': 100000,
+        'maxFeePerGas': gas_price * 2,
+        'maxPriorityFeePerGas': gas_price,
+        'chainId': CHAIN_ID
+    }
+    
+    signed_tx = account.sign_transaction(tx)
+    # eth-account 0.10 (pinned) names it rawTransaction, newer versions raw_transaction
+    return getattr(signed_tx, "raw_transaction", None) or signed_tx.rawTransaction
+
+def build_and_send(account, to_grant, base_nonce, gas_price):
+    """
+    Sign grantRole for every contract with nonces base_nonce, base_nonce+1, ...
+    and broadcast all of them in one batch - returns [(contract_name, tx_hash)]
+    """
+    nonces = range(base_nonce, base_nonce + len(to_grant))
+    
+    pending = []
+    for (contract_name, contract_address), nonce in zip(to_grant, nonces):
+        try:
+            raw_tx = grant_admin_role(account, contract_address, contract_name, nonce, gas_price)
+        except Exception as e:
+            # Stop here - skipping a nonce would block all later txs
+            print(f"❌ ERROR: {e}")
+            break
+        pending.append((contract_name, raw_tx))
+    
+    if not pending:
+        return []
+    
+    results = rpc_batch(
+        [("eth_sendRawTransaction", [Web3.to_hex(raw_tx)]) for _, raw_tx in pending],
+        raise_errors=False
+    )
+    sent = []
+    for (contract_name, _), result in zip(pending, results):
+        if isinstance(result, Exception):
+            print(f"❌ {contract_name}: ERROR: {result}")
+            continue
+        print(f"📤 {contract_name}: Transaction sent: {result}")
+        print(f"🔗 Basescan: https://basescan.org/tx/{result}")
+        sent.append((contract_name, result))
+    return sent
+
+def wait_for_receipt(contract_name, tx_hash):
+    """Wait for one receipt and print the result"""
     try:
-        contract = w3.eth.contract(
-            address=Web3.to_checksum_address(contract_address),
-            abi=ACCESS_CONTROL_ABI
-        )
-        
-        # Check if Safe already has role
-        has_role = contract.functions.hasRole(DEFAULT_ADMIN_ROLE, SAFE_WALLET).call()
-        if has_role:
-            print(f"✅ Safe Wallet already has DEFAULT_ADMIN_ROLE - skipping")
-            return None
-        
-        print(f"🔄 Granting DEFAULT_ADMIN_ROLE to Safe Wallet...")
-        
-        # Build transaction
-        nonce = w3.eth.get_transaction_count(BACKEND_ADDRESS)
-        gas_price = w3.eth.gas_price
-        
-        tx = contract.functions.grantRole(DEFAULT_ADMIN_ROLE, SAFE_WALLET).build_transaction({
-            'from': BACKEND_ADDRESS,
-            'nonce': nonce,
-            'gas': 100000,
-            'maxFeePerGas': gas_price * 2,
-            'maxPriorityFeePerGas': gas_price,
-            'chainId': CHAIN_ID
-        })
-        
-        # Sign and send
-        signed_tx = account.sign_transaction(tx)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        
-        print(f"📤 Transaction sent: {tx_hash.hex()}")
-        print(f"🔗 Basescan: https://basescan.org/tx/{tx_hash.hex()}")
-        print(f"⏳ Waiting for confirmation...")
-        
         receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-        
-        if receipt['status'] == 1:
-            gas_used = receipt['gasUsed']
-            gas_cost = w3.from_wei(gas_used * receipt['effectiveGasPrice'], 'ether')
-            print(f"✅ SUCCESS!")
-            print(f"   Gas Used: {gas_used}")
-            print(f"   Cost: {gas_cost:.6f} ETH")
-            return tx_hash.hex()
-        else:
-            print(f"❌ FAILED - Transaction reverted")
-            return None
-            
     except Exception as e:
-        print(f"❌ ERROR: {e}")
+        print(f"❌ {contract_name}: ERROR: {e}")
+        return None
+    
+    if receipt['status'] == 1:
+        gas_used = receipt['gasUsed']
+        gas_cost = w3.from_wei(gas_used * receipt['effectiveGasPrice'], 'ether')
+        print(f"✅ {contract_name}: SUCCESS!")
+        print(f"   Gas Used: {gas_used}")
+        print(f"   Cost: {gas_cost:.6f} ETH")
+        return tx_hash
+    else:
+        print(f"❌ {contract_name}: FAILED - Transaction reverted")
         return None
 
-# Ask for confirmation
-print("\n" + "=" * 80)
-print("⚠️  READY TO EXECUTE")
-print("=" * 80)
-print("\n📝 This script will grant DEFAULT_ADMIN_ROLE to Safe Wallet on:")
-print(f"   1. AEraIdentityNFT ({IDENTITY_NFT[:10]}...)")
-print(f"   2. AEraResonanceScore ({RESONANCE_SCORE[:10]}...)")
-print(f"   3. AEraResonanceRegistry ({REGISTRY[:10]}...)")
-print(f"\n💸 Estimated Cost: ~0.0003 ETH (3 transactions)")
-
-response = input("\n❓ Continue? (yes/no): ")
-if response.lower() != "yes":
-    print("❌ Aborted by user")
-    exit(0)
-
-# Grant roles
-print("\n" + "=" * 80)
-print("🚀 GRANTING ADMIN ROLES")
-print("=" * 80)
-
-tx_hashes = []
-
-# 1. AEraIdentityNFT
-tx = grant_admin_role(IDENTITY_NFT, "AEraIdentityNFT")
-if tx:
-    tx_hashes.append(("AEraIdentityNFT", tx))
-time.sleep(3)
-
-# 2. AEraResonanceScore
-tx = grant_admin_role(RESONANCE_SCORE, "AEraResonanceScore")
-if tx:
-    tx_hashes.append(("AEraResonanceScore", tx))
-time.sleep(3)
-
-# 3. AEraResonanceRegistry
-tx = grant_admin_role(REGISTRY, "AEraResonanceRegistry")
-if tx:
-    tx_hashes.append(("AEraResonanceRegistry", tx))
-
-# Summary
-print("\n" + "=" * 80)
-print("🎉 SETUP COMPLETE!")
-print("=" * 80)
-print(f"\n✅ Safe Wallet ({SAFE_WALLET}) now has admin rights on all contracts!")
-print(f"\n📊 Summary:")
-print(f"   ✅ {len(tx_hashes)} transactions executed")
-print(f"   🔐 Safe Wallet can now manage all contract roles")
-print(f"   🤖 Backend Wallet still has admin rights (can be revoked later)")
-
-if tx_hashes:
-    print("\n📝 Transaction Hashes:")
-    for contract_name, tx_hash in tx_hashes:
-        print(f"   • {contract_name}:")
-        print(f"     https://basescan.org/tx/{tx_hash}")
-
-print("\n" + "=" * 80)
-print("✅ All 3 wallets now have appropriate access:")
-print("=" * 80)
-print(f"1. Backend Wallet ({BACKEND_ADDRESS[:10]}...)")
-print(f"   • DEFAULT_ADMIN_ROLE on all contracts")
-print(f"   • Used by server for automated operations")
-print(f"\n2. Admin Wallet ({os.getenv('ADMIN_WALLET')[:10]}...)")
-print(f"   • Can be used for manual operations")
-print(f"\n3. Safe Wallet ({SAFE_WALLET[:10]}...)")
-print(f"   • DEFAULT_ADMIN_ROLE on all contracts")
-print(f"   • Multisig protection for critical operations")
-print("\n✨ Your AEra system is fully configured on BASE Mainnet!")
+def wait_and_report(sent):
+    """
+    Wait for all receipts in parallel - total time ≈ one block, not N
+    Returns [(contract_name, tx_hash)] of the successful transactions
+    """
+    if not sent:
+        return []
+    
+    print(f"⏳ Waiting for {len(sent)} confirmation(s)...")
+    with ThreadPoolExecutor(max_workers=len(sent)) as executor:
+        confirmed = list(executor.map(lambda item: wait_for_receipt(*item), sent))
+    
+    return [
+        (contract_name, tx_hash)
+        for (contract_name, _), tx_hash in zip(sent, confirmed)
+        if tx_hash
+    ]
+
+def main():
+    account = Account.from_key(BACKEND_PRIVATE_KEY)
+    
+    print("=" * 80)
+    print("🔐 ADD SAFE WALLET AS ADMIN - BASE MAINNET")
+    print("=" * 80)
+    print(f"\n📍 Network: BASE Mainnet (Chain ID: {CHAIN_ID})")
+    print(f"🤖 Backend Wallet (Current Admin): {BACKEND_ADDRESS}")
+    print(f"🔐 Safe Wallet (New Admin): {SAFE_WALLET}")
+    
+    # 1 batch: balance, chain id, gas price, nonce, hasRole × 3
+    prechecks = fetch_prechecks()
+    print(f"\n💰 Backend Balance: {w3.from_wei(prechecks['balance'], 'ether'):.6f} ETH")
+    
+    if prechecks["chain_id"] != CHAIN_ID:
+        print(f"❌ RPC is on chain {prechecks['chain_id']}, expected {CHAIN_ID} - aborting")
+        return
+    
+    # Ask for confirmation
+    print("\n" + "=" * 80)
+    print("⚠️  READY TO EXECUTE")
+    print("=" * 80)
+    print("\n📝 This script will grant DEFAULT_ADMIN_ROLE to Safe Wallet on:")
+    print(f"   1. AEraIdentityNFT ({IDENTITY_NFT[:10]}...)")
+    print(f"   2. AEraResonanceScore ({RESONANCE_SCORE[:10]}...)")
+    print(f"   3. AEraResonanceRegistry ({REGISTRY[:10]}...)")
+    print(f"\n💸 Estimated Cost: ~0.0003 ETH (3 transactions)")
+
+    response = input("\n❓ Continue? (yes/no): ")
+    if response.lower() != "yes":
+        print("❌ Aborted by user")
+        return
+
+    # Grant roles
+    print("\n" + "=" * 80)
+    print("🚀 GRANTING ADMIN ROLES")
+    print("=" * 80)
+
+    to_grant = []
+    for (contract_name, contract_address), has_role in zip(CONTRACTS, prechecks["has_roles"]):
+        if has_role:
+            print(f"\n✅ {contract_name}: Safe Wallet already has DEFAULT_ADMIN_ROLE - skipping")
+        else:
+            to_grant.append((contract_name, contract_address))
+
+    # All txs enter the mempool together - nonce order (not sleeps) sequences them
+    sent = build_and_send(account, to_grant, prechecks["nonce"], prechecks["gas_price"])
+    tx_hashes = wait_and_report(sent)
+
+    # Summary
+    print("\n" + "=" * 80)
+    print("🎉 SETUP COMPLETE!")
+    print("=" * 80)
+    print(f"\n✅ Safe Wallet ({SAFE_WALLET}) now has admin rights on all contracts!")
+    print(f"\n📊 Summary:")
+    print(f"   ✅ {len(tx_hashes)} transactions executed")
+    print(f"   🔐 Safe Wallet can now manage all contract roles")
+    print(f"   🤖 Backend Wallet still has admin rights (can be revoked later)")
+
+    if tx_hashes:
+        print("\n📝 Transaction Hashes:")
+        for contract_name, tx_hash in tx_hashes:
+            print(f"   • {contract_name}:")
+            print(f"     https://basescan.org/tx/{tx_hash}")
+
+    print("\n" + "=" * 80)
+    print("✅ All 3 wallets now have appropriate access:")
+    print("=" * 80)
+    print(f"1. Backend Wallet ({BACKEND_ADDRESS[:10]}...)")
+    print(f"   • DEFAULT_ADMIN_ROLE on all contracts")
+    print(f"   • Used by server for automated operations")
+    print(f"\n2. Admin Wallet ({os.getenv('ADMIN_WALLET')[:10]}...)")
+    print(f"   • Can be used for manual operations")
+    print(f"\n3. Safe Wallet ({SAFE_WALLET[:10]}...)")
+    print(f"   • DEFAULT_ADMIN_ROLE on all contracts")
+    print(f"   • Multisig protection for critical operations")
+    print("\n✨ Your AEra system is fully configured on BASE Mainnet!")
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ AEra Follow-Reward Worker
 """
 
 import sqlite3
-import time
+import asyncio
 import logging
 import os
 from datetime import datetime
@@ -14,11 +14,21 @@ import sys
 
 # Optional: Web3 für echte Transfers
 try:
-    from web3 import Web3
+    import aiohttp
+    from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
+    from eth_account import Account
+    from eth_abi import encode as abi_encode
     WEB3_AVAILABLE = True
 except ImportError:
     WEB3_AVAILABLE = False
 
+# Optional: watchfiles (inotify) - Worker wacht nur bei DB-Änderungen auf
+try:
+    from watchfiles import awatch
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
@@ -37,20 +47,37 @@ SEPOLIA_RPC_URL = os.getenv("SEPOLIA_RPC_URL", "https://eth-sepolia.g.alchemy.co
 AERA_CONTRACT = "0x5032206396A6001eEaD2e0178C763350C794F69e"
 FOLLOW_REWARD_AMOUNT = 0.05  # 0.05 AERA pro Follow
 FOLLOW_REWARD_AMOUNT_WEI = int(FOLLOW_REWARD_AMOUNT * 10**18)
+FOLLOWER_BATCH_SIZE = 10
+HEARTBEAT_SECONDS = 300  # Sicherheitsnetz, falls ein Event verloren geht
+DATA_VERSION_POLL_SECONDS = 30  # Fallback ohne watchfiles (altes Polling-Intervall)
+REWARD_QUEUE_SIZE = 16  # Puffer zwischen den Pipeline-Stufen
+RECEIPT_TIMEOUT_SECONDS = 120
 
-# ERC-20 Transfer ABI
-ERC20_ABI = [
-    {
-        "constant": False,
-        "inputs": [
-            {"name": "_to", "type": "address"},
-            {"name": "_value", "type": "uint256"}
-        ],
-        "name": "transfer",
-        "outputs": [{"name": "", "type": "bool"}],
-        "type": "function"
-    }
-]
+# Checksum-Adressen einmal beim Import statt pro Reward
+if WEB3_AVAILABLE:
+    AERA_CONTRACT_CS = Web3.to_checksum_address(AERA_CONTRACT)
+    ADMIN_WALLET_CS = Web3.to_checksum_address(ADMIN_WALLET) if Web3.is_address(ADMIN_WALLET) else ADMIN_WALLET
+    # ERC-20 transfer(address,uint256) - Selector einmal, Calldata ohne Contract-Objekt
+    TRANSFER_SELECTOR = Web3.keccak(text="transfer(address,uint256)")[:4]
+else:
+    AERA_CONTRACT_CS = AERA_CONTRACT
+    ADMIN_WALLET_CS = ADMIN_WALLET
+    TRANSFER_SELECTOR = None
+SEPOLIA_CHAIN_ID = 11155111
+
+# Attributname der signierten TX hängt von der eth-account Version ab
+# (raw_transaction / rawTransaction / raw) - wird beim ersten Signieren einmal ermittelt
+_RAW_TX_ATTR = None
+
+def get_raw_tx(signed_tx) -> bytes:
+    """Raw Transaction Bytes ohne AttributeError-Kette pro Reward"""
+    global _RAW_TX_ATTR
+    if _RAW_TX_ATTR is None:
+        _RAW_TX_ATTR = next(
+            (attr for attr in ("raw_transaction", "rawTransaction", "raw") if hasattr(signed_tx, attr)),
+            ""
+        )
+    return getattr(signed_tx, _RAW_TX_ATTR) if _RAW_TX_ATTR else bytes(signed_tx)
 
 def get_db_connection():
     """Stellt Datenbankverbindung her"""
@@ -59,106 +86,206 @@ def get_db_connection():
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA synchronous=NORMAL")
     conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")  # 256 MB, Lesezugriffe über mmap
     return conn
 
-def connect_web3():
-    """Verbinde zu Sepolia Testnet"""
+async def connect_web3():
+    """Verbinde zu Sepolia Testnet (async)"""
     if not WEB3_AVAILABLE:
         logger.warning("⚠️ web3 nicht verfügbar - Demo-Modus aktiv")
         return None
     
     try:
-        w3 = Web3(Web3.HTTPProvider(SEPOLIA_RPC_URL))
+        provider = AsyncHTTPProvider(
+            SEPOLIA_RPC_URL,
+            request_kwargs={"timeout": aiohttp.ClientTimeout(total=5)}
+        )
+        # Eigene gepoolte aiohttp Session; is_connected() wärmt die Verbindung vor
+        await provider.cache_async_session(aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=16, keepalive_timeout=60)
+        ))
+        w3 = AsyncWeb3(provider)
         
-        if not w3.is_connected():
-            logger.error(f"❌ Kann nicht zu Sepolia verbinden: {SEPOLIA_RPC_URL}")
+        if not await w3.is_connected():
+            logger.error("❌ Kann nicht zu Sepolia verbinden: %s", SEPOLIA_RPC_URL)
             return None
         
-        logger.info(f"✓ Verbunden zu Sepolia (Block: {w3.eth.block_number})")
+        logger.info("✓ Verbunden zu Sepolia (Block: %s)", await w3.eth.block_number)
         return w3
     except Exception as e:
-        logger.error(f"❌ Web3-Verbindungsfehler: {str(e)}")
+        logger.error("❌ Web3-Verbindungsfehler: %s", e)
         return None
 
-def send_follow_reward(w3, follower_address: str, amount_wei: int) -> dict:
+def sign_follow_reward(follower_address: str, amount_wei: int,
+                       nonce: int, gas_price: int) -> bytes:
+    """
+    Baut + signiert den Follow-Reward (0.05 AERA) lokal, ohne RPC
+    
+    follower_address ist bereits geprüft + checksummed (send_follow_rewards),
+    nonce und gas_price werden vom Aufrufer einmal pro Batch geholt.
+    """
+    logger.debug("💰 Signiere Follow-Reward: %s AERA → %s...", amount_wei / 10**18, follower_address[:10])
+    
+    # Baue Transaction direkt (keine web3 Contract/Middleware-Kette)
+    tx = {
+        'to': AERA_CONTRACT_CS,
+        'data': TRANSFER_SELECTOR + abi_encode(['address', 'uint256'], [follower_address, amount_wei]),
+        'value': 0,
+        'nonce': nonce,
+        'gas': 100000,
+        'gasPrice': gas_price,
+        'chainId': SEPOLIA_CHAIN_ID
+    }
+    
+    signed_tx = Account.sign_transaction(tx, ADMIN_PRIVATE_KEY)
+    return get_raw_tx(signed_tx)
+
+def reward_failed(error, retry: bool = True) -> dict:
+    """
+    Ergebnis-Dict für einen fehlgeschlagenen Reward.
+    retry=True: keine TX on-chain → Follower bleibt follow_confirmed = 0 und
+    wird im nächsten Durchlauf erneut versucht.
+    """
+    return {"success": False, "tx_hash": None, "error": str(error), "status": "failed", "retry": retry}
+
+async def send_follow_rewards(w3, followers, on_sent=None) -> list:
     """
-    Sendet Follow-Reward (0.05 AERA) an Follower
+    Versendet Rewards für einen Batch als Pipeline:
+    signer → (Queue) → sender → (Queue) → confirmer
+    Während TX n noch unterwegs ist bzw. auf ihr Receipt wartet, wird
+    TX n+1 schon signiert. Nonce + Gas-Preis werden EINMAL geholt,
+    Nonces lokal hochgezählt. Gesendet wird strikt in Nonce-Reihenfolge;
+    schlägt ein Versand fehl, werden die folgenden Nonces NICHT mehr
+    gesendet (sie blieben sonst hinter der Lücke im Mempool hängen).
+    on_sent(index, tx_hash) wird direkt nach dem Versand aufgerufen (vor dem
+    Receipt), damit der Aufrufer den Versand sofort persistieren kann.
     """
-    if not w3:
-        return {
-            "success": False,
-            "tx_hash": None,
-            "error": "Web3 not available - Demo mode"
-        }
+    # Ungültige Adressen vorab aussortieren, damit keine Nonce-Lücke entsteht
+    results = [None] * len(followers)
+    valid = []
+    checksummed = {}
+    for i, follower in enumerate(followers):
+        if Web3.is_address(follower['follower_address']):
+            valid.append(i)
+            checksummed[i] = Web3.to_checksum_address(follower['follower_address'])
+        else:
+            results[i] = reward_failed("Invalid follower address", retry=False)
+    
+    if not valid:
+        return results
+    
+    logger.info("💸 Versende %d × 0.05 AERA Reward...", len(valid))
     
     try:
-        if not Web3.is_address(follower_address):
-            return {"success": False, "tx_hash": None, "error": "Invalid follower address"}
-        
-        follower_address = Web3.to_checksum_address(follower_address)
-        admin_wallet = Web3.to_checksum_address(ADMIN_WALLET)
-        contract_address = Web3.to_checksum_address(AERA_CONTRACT)
-        
-        logger.info(f"💰 Versende Follow-Reward: {amount_wei / 10**18} AERA → {follower_address[:10]}...")
-        
-        # Verbinde zum Contract
-        contract = w3.eth.contract(address=contract_address, abi=ERC20_ABI)
-        
-        # Hole Nonce
-        nonce = w3.eth.get_transaction_count(admin_wallet)
-        
-        # Baue Transaction
-        tx = contract.functions.transfer(
-            follower_address,
-            amount_wei
-        ).build_transaction({
-            'from': admin_wallet,
-            'nonce': nonce,
-            'gas': 100000,
-            'gasPrice': w3.eth.gas_price,
-            'chainId': 11155111  # Sepolia
-        })
-        
-        # Signiere
-        signed_tx = w3.eth.account.sign_transaction(tx, ADMIN_PRIVATE_KEY)
-        
-        # Versende
+        base_nonce, gas_price = await asyncio.gather(
+            w3.eth.get_transaction_count(ADMIN_WALLET_CS, "pending"),
+            w3.eth.gas_price
+        )
+    except Exception as e:
+        logger.error("❌ Nonce/Gas-Preis Fehler: %s", e)
+        for i in valid:
+            results[i] = reward_failed(e)
+        return results
+    
+    signed_queue = asyncio.Queue(maxsize=REWARD_QUEUE_SIZE)  # (index, raw_tx)
+    sent_queue = asyncio.Queue(maxsize=REWARD_QUEUE_SIZE)  # (index, tx_hash)
+    send_failed = False  # nach dem ersten Versand-Fehler keine höheren Nonces mehr senden
+    tasks = set()  # Referenzen halten, sonst kann der GC laufende Tasks einsammeln
+    
+    def spawn(coro):
+        task = asyncio.create_task(coro)
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    
+    async def send_one(i, raw_tx):
+        nonlocal send_failed
+        if send_failed:
+            results[i] = reward_failed("Skipped: earlier nonce in batch failed")
+            return
         try:
-            raw_tx = signed_tx.raw_transaction
-        except AttributeError:
-            try:
-                raw_tx = signed_tx.raw
-            except AttributeError:
-                raw_tx = bytes(signed_tx)
-        
-        tx_hash = w3.eth.send_raw_transaction(raw_tx)
+            tx_hash = await w3.eth.send_raw_transaction(raw_tx)
+        except Exception as e:
+            logger.error("❌ Follow-Reward Fehler: %s", e)
+            results[i] = reward_failed(e)
+            send_failed = True
+            return
+        logger.debug("✓ Follow-Reward TX versendet: %s...", tx_hash.hex()[:20])
+        if on_sent is not None:
+            on_sent(i, tx_hash)
+        await sent_queue.put((i, tx_hash))
+    
+    async def confirm_one(i, tx_hash):
         tx_hash_str = tx_hash.hex()
+        try:
+            receipt = await w3.eth.wait_for_transaction_receipt(tx_hash, timeout=RECEIPT_TIMEOUT_SECONDS)
+            if receipt['status'] == 1:
+                results[i] = {"success": True, "tx_hash": tx_hash_str, "error": None, "status": "completed"}
+            else:
+                # Nonce ist verbraucht (TX gemined) → nicht automatisch erneut senden
+                results[i] = reward_failed(f"Transaction reverted: {tx_hash_str}", retry=False)
+        except Exception as e:
+            # Versendet, aber (noch) kein Receipt - TX kann trotzdem durchgehen
+            logger.warning("⏳ Kein Receipt für %s...: %s", tx_hash_str[:20], e)
+            results[i] = {"success": True, "tx_hash": tx_hash_str, "error": None, "status": "submitted"}
+        finally:
+            sent_queue.task_done()
+    
+    async def sender():
+        # Sequentiell: TX n+1 erst senden, wenn TX n angenommen wurde
+        while True:
+            i, raw_tx = await signed_queue.get()
+            try:
+                await send_one(i, raw_tx)
+            finally:
+                signed_queue.task_done()
+    
+    async def confirmer():
+        while True:
+            i, tx_hash = await sent_queue.get()
+            spawn(confirm_one(i, tx_hash))
+    
+    stages = [asyncio.create_task(sender()), asyncio.create_task(confirmer())]
+    try:
+        # signer: CPU-Arbeit, zwischen den Signaturen laufen sender/confirmer
+        # Nonce zählt nur erfolgreich signierte TX - eine fehlgeschlagene Signatur
+        # verbraucht keine Nonce, sonst entstünde eine Lücke
+        n_signed = 0
+        for i in valid:
+            if send_failed:
+                results[i] = reward_failed("Skipped: earlier nonce in batch failed")
+                continue
+            try:
+                raw_tx = sign_follow_reward(
+                    checksummed[i], FOLLOW_REWARD_AMOUNT_WEI,
+                    nonce=base_nonce + n_signed, gas_price=gas_price
+                )
+            except Exception as e:
+                logger.error("❌ Follow-Reward Signatur fehlgeschlagen: %s", e)
+                results[i] = reward_failed(e)
+                continue
+            n_signed += 1
+            await signed_queue.put((i, raw_tx))
+            await asyncio.sleep(0)
         
-        logger.info(f"✓ Follow-Reward TX versendet: {tx_hash_str[:20]}...")
-        
-        return {
-            "success": True,
-            "tx_hash": tx_hash_str,
-            "error": None
-        }
-        
-    except Exception as e:
-        logger.error(f"❌ Follow-Reward Fehler: {str(e)}")
-        return {
-            "success": False,
-            "tx_hash": None,
-            "error": str(e)
-        }
+        await signed_queue.join()
+        await sent_queue.join()
+    finally:
+        for stage in stages:
+            stage.cancel()
+    
+    return results
 
-def process_new_followers(w3):
+async def process_new_followers(w3):
     """
     Verarbeitet neue Follower und vergibt Rewards (0.05 AERA)
     
     Logik:
     1. Finde Followers wo follow_confirmed = 0 (noch nicht belohnt)
     2. Vergleiche verified_at Timestamp mit aktuellem Timestamp
-    3. Wenn neue Follow-Anfrage: Versende 0.05 AERA
-    4. Markiere als follow_confirmed = 1
+    3. Wenn neue Follow-Anfrage: Versende 0.05 AERA (signieren → senden → Receipt als Pipeline)
+    4. Markiere als follow_confirmed = 1 - versendete sofort nach dem Versand
+       (nicht erst nach dem Receipt), damit ein Neustart nicht doppelt zahlt
     """
     try:
         conn = get_db_connection()
@@ -170,114 +297,179 @@ def process_new_followers(w3):
             FROM followers
             WHERE follow_confirmed = 0 AND verified = 1
             ORDER BY verified_at ASC
-            LIMIT 10
-        """)
+            LIMIT ?
+        """, (FOLLOWER_BATCH_SIZE,))
         
         new_followers = cursor.fetchall()
         
         if not new_followers:
             logger.debug("ℹ️ Keine neuen Follow-Anfragen gefunden")
             conn.close()
-            return
+            return 0
+        
+        logger.info("🎯 Verarbeite %d neue Follower...", len(new_followers))
+        
+        # Alle Follower des Batches werden gemeinsam bestätigt → ein Timestamp
+        current_timestamp = datetime.utcnow().isoformat()
+        persisted = set()  # Indizes, die schon beim Versand markiert wurden
+        
+        def mark_sent(i, tx_hash):
+            """Versendeten Reward sofort festschreiben (Crash vor dem Receipt → kein Doppel-Reward)"""
+            try:
+                cursor.execute("""
+                    UPDATE followers
+                    SET follow_confirmed = 1, confirmed_at = ?
+                    WHERE id = ?
+                """, (current_timestamp, new_followers[i]['id']))
+                conn.commit()
+                persisted.add(i)
+            except Exception as e:
+                logger.error("❌ Konnte versendeten Reward #%s nicht markieren: %s", new_followers[i]['id'], e)
+        
+        # Versende alle Follow-Rewards (0.05 AERA) gleichzeitig
+        if w3 and ADMIN_WALLET and ADMIN_PRIVATE_KEY:
+            rewards = await send_follow_rewards(w3, new_followers, on_sent=mark_sent)
+        else:
+            rewards = None
         
-        logger.info(f"🎯 Verarbeite {len(new_followers)} neue Follower...")
+        # (confirmed_at, id) für alle noch nicht markierten - ein executemany + ein Commit
+        updates = []
+        retry_later = 0
         
-        for follower in new_followers:
+        for i, follower in enumerate(new_followers):
             follower_id = follower['id']
-            owner = follower['owner_wallet']
-            follower_addr = follower['follower_address']
-            platform = follower['source_platform']
-            verified_at = follower['verified_at']
             
-            logger.info(f"")
-            logger.info(f"{'=' * 70}")
-            logger.info(f"📋 NEW FOLLOWER #{follower_id}")
-            logger.info(f"   Owner:      {owner[:10]}...{owner[-4:]}")
-            logger.info(f"   Follower:   {follower_addr[:10]}...{follower_addr[-4:]}")
-            logger.info(f"   Platform:   {platform}")
-            logger.info(f"   Score:      {follower['follower_score']}/100")
-            logger.info(f"   Registered: {verified_at}")
-            
-            # Versende Follow-Reward (0.05 AERA)
-            if w3 and ADMIN_WALLET and ADMIN_PRIVATE_KEY:
-                logger.info(f"💸 Versende 0.05 AERA Reward...")
-                reward_result = send_follow_reward(w3, follower_addr, FOLLOW_REWARD_AMOUNT_WEI)
+            if rewards is not None:
+                reward_result = rewards[i]
                 
+                reward_status = reward_result["status"]
                 if reward_result["success"]:
-                    logger.info(f"✅ Reward erfolgreich versendet!")
-                    logger.info(f"   TX: {reward_result['tx_hash'][:30]}...")
-                    reward_status = "completed"
                     reward_tx = reward_result['tx_hash']
                 else:
-                    logger.warning(f"⚠️ Reward fehlgeschlagen: {reward_result['error']}")
-                    reward_status = "failed"
+                    logger.warning("⚠️ Reward fehlgeschlagen (#%s): %s", follower_id, reward_result['error'])
                     reward_tx = reward_result['error']
             else:
-                logger.info(f"ℹ️ Demo-Modus: Reward wird nicht versendet")
                 reward_status = "demo_pending"
                 reward_tx = "DEMO_MODE"
             
-            # Markiere Follower als belohnt (follow_confirmed = 1)
-            current_timestamp = datetime.utcnow().isoformat()
-            
-            cursor.execute("""
-                UPDATE followers
-                SET follow_confirmed = 1, confirmed_at = ?
-                WHERE id = ?
-            """, (current_timestamp, follower_id))
-            
-            conn.commit()
+            # Markiere Follower als belohnt (follow_confirmed = 1), falls nicht schon beim
+            # Versand - außer der Reward wurde nie gesendet, dann nächster Durchlauf
+            if rewards is not None and rewards[i].get("retry"):
+                retry_later += 1
+            elif i not in persisted:
+                updates.append((current_timestamp, follower_id))
             
-            logger.info(f"✓ Reward Status: {reward_status}")
-            logger.info(f"   Timestamp: {current_timestamp}")
-            logger.info(f"{'=' * 70}")
+            # Ein Log-Record pro Follower statt ~10 Zeilen
+            logger.info(
+                "📋 follow_reward id=%s owner=%s follower=%s platform=%s score=%s registered=%s tx=%s status=%s",
+                follower_id, follower['owner_wallet'], follower['follower_address'],
+                follower['source_platform'], follower['follower_score'], follower['verified_at'],
+                reward_tx, reward_status
+            )
             
+        cursor.executemany("""
+            UPDATE followers
+            SET follow_confirmed = 1, confirmed_at = ?
+            WHERE id = ?
+        """, updates)
+        conn.commit()
+        
         conn.close()
-        logger.info(f"✅ Follow-Reward Verarbeitung abgeschlossen")
+        if retry_later:
+            logger.warning("🔁 %d Reward(s) nicht gesendet - erneuter Versuch im nächsten Durchlauf", retry_later)
+        logger.info("✅ Follow-Reward Verarbeitung abgeschlossen")
+        # Nur abgeschlossene zählen: ein Batch mit Fehlern löst kein sofortiges Weiterlaufen aus
+        return len(new_followers) - retry_later
         
     except Exception as e:
-        logger.error(f"❌ Fehler bei Follow-Verarbeitung: {str(e)}")
+        logger.error("❌ Fehler bei Follow-Verarbeitung: %s", e)
         import traceback
         logger.error(traceback.format_exc())
+        return 0
 
-def main():
+async def watch_db_changes(db_changed: asyncio.Event):
+    """
+    Setzt db_changed, sobald in aera.db geschrieben wird (z.B. neuer Follower
+    vom Server-Prozess). Mit watchfiles per inotify, sonst über PRAGMA data_version.
+    """
+    db_path = os.path.abspath(DB_PATH)
+    
+    if WATCHFILES_AVAILABLE:
+        db_files = {db_path, db_path + "-wal"}
+        async for _ in awatch(os.path.dirname(db_path), watch_filter=lambda change, path: path in db_files):
+            db_changed.set()
+    
+    # data_version ändert sich bei jedem Commit einer ANDEREN Verbindung
+    conn = sqlite3.connect(db_path, timeout=10.0)
+    try:
+        last_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        while True:
+            await asyncio.sleep(DATA_VERSION_POLL_SECONDS)
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version != last_version:
+                last_version = version
+                db_changed.set()
+    finally:
+        conn.close()
+
+async def main_async():
     """Hauptschleife des Follow-Reward Workers"""
-    logger.info("=" * 80)
-    logger.info("🚀 AEra Follow-Reward Worker - GESTARTET")
-    logger.info("=" * 80)
-    logger.info("📊 Überwacht neue Follower und vergibt 0.05 AERA Rewards")
-    logger.info("")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("=" * 80)
+        logger.info("🚀 AEra Follow-Reward Worker - GESTARTET")
+        logger.info("=" * 80)
+        logger.info("📊 Überwacht neue Follower und vergibt 0.05 AERA Rewards")
+        logger.info("")
     
     if not ADMIN_WALLET or not ADMIN_PRIVATE_KEY:
         logger.warning("⚠️ Admin-Credentials nicht konfiguriert")
         logger.warning("   → Läufe im DEMO-MODUS (Rewards werden NICHT versendet)")
         w3 = None
     else:
-        logger.info(f"✓ Admin Wallet: {ADMIN_WALLET[:10]}...{ADMIN_WALLET[-4:]}")
-        w3 = connect_web3() if WEB3_AVAILABLE else None
+        logger.info("✓ Admin Wallet: %s...%s", ADMIN_WALLET[:10], ADMIN_WALLET[-4:])
+        w3 = await connect_web3() if WEB3_AVAILABLE else None
         if w3:
-            logger.info(f"✓ Web3 verbunden zu Sepolia")
+            logger.info("✓ Web3 verbunden zu Sepolia")
         else:
             logger.warning("⚠️ Web3 nicht verfügbar - Rewards können nicht versendet werden")
     
-    logger.info("=" * 80)
-    logger.info("⏳ Überwache Follow-Anfragen (Drücke Ctrl+C zum Beenden)...")
-    logger.info("=" * 80)
-    logger.info("")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("=" * 80)
+        logger.info("⏳ Überwache Follow-Anfragen (Drücke Ctrl+C zum Beenden)...")
+        logger.info("=" * 80)
+        logger.info("")
     
-    try:
-        while True:
-            try:
-                process_new_followers(w3)
-                time.sleep(30)  # Überprüfe alle 30 Sekunden
-            except KeyboardInterrupt:
-                raise
-            except Exception as e:
-                logger.error(f"❌ Fehler in Hauptschleife: {str(e)}")
-                import traceback
-                logger.error(traceback.format_exc())
-                time.sleep(10)
+    # Event-gesteuert statt 30s-Polling
+    db_changed = asyncio.Event()
+    watcher = asyncio.create_task(watch_db_changes(db_changed))
     
+    while True:
+        try:
+            # Vor der Verarbeitung zurücksetzen → Änderungen währenddessen lösen erneut aus
+            db_changed.clear()
+            processed = await process_new_followers(w3)
+            
+            if processed >= FOLLOWER_BATCH_SIZE:
+                continue  # Es warten vermutlich noch weitere Follower
+            
+            if watcher.done():
+                # Watcher abgestürzt → neu starten
+                logger.warning("⚠️ DB-Watcher beendet, starte neu: %s", watcher.exception())
+                watcher = asyncio.create_task(watch_db_changes(db_changed))
+            
+            try:
+                await asyncio.wait_for(db_changed.wait(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                pass  # Heartbeat
+        except Exception as e:
+            logger.error("❌ Fehler in Hauptschleife: %s", e)
+            import traceback
+            logger.error(traceback.format_exc())
+            await asyncio.sleep(10)
+
+def main():
+    try:
+        asyncio.run(main_async())
     except KeyboardInterrupt:
         logger.info("\n")
         logger.info("=" * 80)
@@ -1,188 +1,529 @@
 #!/usr/bin/env python3
 """
 Analyse aller 3 Smart Contracts auf BASE Sepolia
+
+Mit --follow werden danach neue Events per WebSocket (eth_subscribe)
+empfangen und direkt in den Log-Cache geschrieben.
 """
 import os
+import sys
+import json
+import asyncio
+import orjson
+import requests
+import websockets
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
 from web3 import Web3
 from datetime import datetime
 from dotenv import load_dotenv
+from hexbytes import HexBytes
+from log_cache import (
+    get_log_cache_connection, missing_ranges, insert_logs, mark_scanned, store_logs,
+    load_logs, remove_log, delete_logs, load_block_timestamps, store_block_timestamps
+)
 
 load_dotenv()
 
-# Web3 Setup
+class OrjsonHTTPProvider(Web3.HTTPProvider):
+    """HTTPProvider, der Antworten mit orjson statt json decodiert (große eth_getLogs Arrays)"""
+    def decode_rpc_response(self, raw_response):
+        return orjson.loads(raw_response)
+
+# Web3 Setup - eine Keep-Alive Session mit Retry für web3 + Batch-Requests
 RPC_URL = "https://sepolia.base.org"
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504], allowed_methods=None)
+))
+w3 = Web3(OrjsonHTTPProvider(RPC_URL, session=session))
+
+# WebSocket Endpoint für den Live-Modus (--follow)
+WS_URL = os.getenv("BASE_SEPOLIA_WS_URL", "wss://base-sepolia-rpc.publicnode.com")
 
 # Contract Addresses
 IDENTITY_NFT = "0xF6f86cc0b916BCfE44cff64b00C2fe6e7954A3Ce"
 RESONANCE_SCORE = "0xD4676a88bfAD40A87c8a5e889EE4AdD1448527c4"
 RESONANCE_REGISTRY = "0xE2d5B85E4A9B0820c59658607C03bC90ba63b7b9"
 
-print("=" * 80)
-print("📊 AERA SMART CONTRACTS - VOLLSTÄNDIGE ANALYSE")
-print("=" * 80)
-print(f"\n🌐 Verbunden mit: {RPC_URL}")
-print(f"✅ Web3 Connected: {w3.is_connected()}")
-print(f"📍 Current Block: {w3.eth.block_number:,}")
+# Ungefähre Deployment-Blöcke (untere Schranke, deployed ~30.11.2025) -
+# vorher gibt es keine Events, eth_getLogs muss dort nicht suchen
+NFT_DEPLOY_BLOCK = 34300000
+SCORE_DEPLOY_BLOCK = 34300000
+REGISTRY_DEPLOY_BLOCK = 34300000
+
+# Ohne from_block werden die letzten ~100k Blöcke gescannt (nie vor dem Deployment)
+DEFAULT_BLOCK_WINDOW = 100000
+
+# kind: "nft" (Transfer/Mints), "score" (Score Updates), "registry" (Interactions)
+CONTRACTS = [
+    {"name": "Identity NFT", "short": "NFT", "address": IDENTITY_NFT, "kind": "nft",
+     "deploy_block": NFT_DEPLOY_BLOCK},
+    {"name": "Resonance Score", "short": "Score", "address": RESONANCE_SCORE, "kind": "score",
+     "deploy_block": SCORE_DEPLOY_BLOCK},
+    {"name": "Resonance Registry", "short": "Registry", "address": RESONANCE_REGISTRY, "kind": "registry",
+     "deploy_block": REGISTRY_DEPLOY_BLOCK},
+]
 
 # Transfer Event Signature (für NFT Mints)
 TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+TRANSFER_TOPIC_BYTES = bytes.fromhex(TRANSFER_TOPIC[2:])
 
-print("\n" + "=" * 80)
-print("1️⃣ IDENTITY NFT CONTRACT")
-print("=" * 80)
-print(f"📍 Address: {IDENTITY_NFT}")
+# InteractionRecorded Event Signature (Registry, siehe contracts/AEraResonanceRegistry.sol)
+INTERACTION_TOPIC_BYTES = bytes(Web3.keccak(
+    text="InteractionRecorded(address,address,bytes32,uint8,uint256,uint256,uint256)"
+))
 
-try:
-    # Get Transfer events (from 0x0 = mints)
-    latest_block = w3.eth.block_number
-    from_block = latest_block - 100000  # Last ~100k blocks
+def rpc_batch(calls, raise_errors=True):
+    """
+    Mehrere JSON-RPC Calls in EINEM HTTP POST
+    calls: [(method, params), ...] - Ergebnisse in derselben Reihenfolge
+    raise_errors=False: fehlgeschlagene Calls liefern einen RuntimeError statt zu werfen
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = session.post(
+        RPC_URL, data=orjson.dumps(payload), headers={"Content-Type": "application/json"}, timeout=30
+    )
+    response.raise_for_status()
+    
+    # Reihenfolge der Antworten ist nicht garantiert → über id zuordnen
+    by_id = {item["id"]: item for item in orjson.loads(response.content)}
+    results = []
+    for i, (method, _) in enumerate(calls):
+        item = by_id.get(i, {"error": "missing response"})
+        if "error" in item:
+            error = RuntimeError(f"{method}: {item['error']}")
+            if raise_errors:
+                raise error
+            results.append(error)
+        else:
+            results.append(item["result"])
+    return results
+
+def get_block_timestamps(block_numbers):
+    """
+    Timestamps mehrerer Blöcke mit einem eth_getBlockByNumber Batch
+    (ohne Transaktionen, nur "timestamp" wird aus dem rohen Header gelesen -
+    kein web3 Formatting der übrigen Felder)
+    """
+    unique_blocks = sorted(set(block_numbers))
+    if not unique_blocks:
+        return {}
+    blocks = rpc_batch([("eth_getBlockByNumber", [hex(bn), False]) for bn in unique_blocks])
+    return {bn: int(block["timestamp"], 16) for bn, block in zip(unique_blocks, blocks)}
+
+block_timestamps = {}
+
+def block_timestamp(block_number):
+    """Unix-Timestamp aus Cache/Batch, Fallback auf einen einzelnen Raw-Call"""
+    timestamp = block_timestamps.get(block_number)
+    if timestamp is None:
+        timestamp = get_block_timestamps([block_number])[block_number]
+        block_timestamps[block_number] = timestamp
+    return timestamp
+
+# Blockbereiche werden in feste Fenster zerlegt (große eth_getLogs Ranges laufen
+# auf öffentlichen RPCs in Timeouts/Result-Limits), mehrere Fenster pro JSON-RPC Batch
+LOG_CHUNK_SIZE = 2_000
+MIN_LOG_CHUNK_SIZE = 50  # fehlgeschlagene Fenster werden bis hierhin halbiert
+LOG_BATCH_SIZE = 10  # eth_getLogs Calls pro HTTP POST
+# Die letzten Blöcke können noch per Reorg ersetzt werden: sie werden gecacht,
+# aber nicht als gescannt markiert und beim nächsten Lauf erneut geladen
+CONFIRMATIONS = 64
+
+def parse_rpc_log(log):
+    """Rohes JSON-RPC Log (Hex-Strings) → Dict wie bei web3 get_logs"""
+    return {
+        'blockNumber': int(log["blockNumber"], 16),
+        'logIndex': int(log["logIndex"], 16),
+        'transactionHash': HexBytes(log["transactionHash"]),
+        'topics': [HexBytes(topic) for topic in log["topics"]],
+        'data': HexBytes(log["data"]),
+    }
+
+def fetch_logs_parallel(contracts, to_block):
+    """
+    eth_getLogs für alle Contracts (und alle Chunks) als JSON-RPC Batches,
+    die Batches laufen parallel. Fehlgeschlagene Chunks werden halbiert und
+    erneut angefragt (z.B. "query returned more than 10000 results").
+    Contracts mit denselben fehlenden Bereichen teilen sich einen Call
+    (address-Liste), die Logs werden danach über log['address'] aufgeteilt.
+    Geladen werden nur Bereiche, die noch nicht im lokalen Log-Cache sind.
+    Jede Batch-Antwort wird sofort in den Cache geschrieben und freigegeben
+    (keine Sammelliste aller Roh-Logs im Speicher), das Ergebnis kommt danach
+    komplett aus dem Cache.
+    contracts: {name: (address, from_block)} → {name: logs oder Exception}
+    """
+    conn = get_log_cache_connection()
     
-    print(f"🔍 Scanning blocks {from_block:,} → {latest_block:,}")
+    # Contracts nach fehlenden Bereichen gruppieren (meist alle gleich)
+    groups = {}
+    for name, (address, from_block) in contracts.items():
+        groups.setdefault(tuple(missing_ranges(conn, address, from_block, to_block)), []).append(name)
+    name_by_address = {address.lower(): name for name, (address, _) in contracts.items()}
     
-    logs = w3.eth.get_logs({
-        'address': IDENTITY_NFT,
-        'fromBlock': from_block,
-        'toBlock': 'latest',
-        'topics': [TRANSFER_TOPIC]
-    })
+    # Noch nicht bestätigte Logs aus früheren Läufen verwerfen, sie werden neu geladen
+    for ranges, names in groups.items():
+        for range_from, end in ranges:
+            for name in names:
+                delete_logs(conn, contracts[name][0], range_from, end)
     
-    print(f"\n📊 Total Transfer Events: {len(logs)}")
+    # (names, start, end) für jeden fehlenden Chunk
+    chunks = [
+        (tuple(names), start, min(start + LOG_CHUNK_SIZE - 1, end))
+        for ranges, names in groups.items()
+        for range_from, end in ranges
+        for start in range(range_from, end + 1, LOG_CHUNK_SIZE)
+    ]
     
-    # Count mints (from = 0x0)
-    mints = [log for log in logs if log['topics'][1] == b'\x00' * 32]
-    print(f"🎨 NFTs Minted: {len(mints)}")
+    errors = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        while chunks:
+            batches = [chunks[i:i + LOG_BATCH_SIZE] for i in range(0, len(chunks), LOG_BATCH_SIZE)]
+            futures = [
+                executor.submit(rpc_batch, [
+                    ("eth_getLogs", [{
+                        "address": [contracts[name][0] for name in names],
+                        "fromBlock": hex(start),
+                        "toBlock": hex(end)
+                    }])
+                    for names, start, end in batch
+                ], False)
+                for batch in batches
+            ]
+            
+            chunks = []  # nächste Runde: halbierte Fenster
+            for batch, future in zip(batches, futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    results = [e] * len(batch)
+                new_logs = {}
+                for (names, start, end), result in zip(batch, results):
+                    if not isinstance(result, Exception):
+                        for log in result:
+                            new_logs.setdefault(name_by_address[log['address'].lower()], []).append(parse_rpc_log(log))
+                    elif end - start + 1 > MIN_LOG_CHUNK_SIZE:
+                        middle = (start + end) // 2
+                        chunks += [(names, start, middle), (names, middle + 1, end)]
+                    else:
+                        for name in names:
+                            errors.setdefault(name, result)
+                # Zwischenstand cachen, gescannter Bereich wird erst am Ende erweitert
+                for name, logs in new_logs.items():
+                    insert_logs(conn, contracts[name][0], logs)
+            # Contracts mit endgültigem Fehler nicht weiter laden
+            chunks = [chunk for chunk in chunks if not any(name in errors for name in chunk[0])]
     
-    if mints:
-        # Get last mint
-        last_mint = mints[-1]
-        last_block_info = w3.eth.get_block(last_mint['blockNumber'])
-        last_time = datetime.fromtimestamp(last_block_info['timestamp'])
-        
-        print(f"\n📅 Letzter Mint:")
-        print(f"   Block: {last_mint['blockNumber']:,}")
-        print(f"   Zeit: {last_time.strftime('%d.%m.%Y %H:%M:%S')}")
-        print(f"   TX: {last_mint['transactionHash'].hex()}")
+    confirmed_block = to_block - CONFIRMATIONS
+    logs_by_contract = {}
+    for name, (address, from_block) in contracts.items():
+        if name in errors:
+            # Bereich unvollständig → nicht als gescannt markieren
+            logs_by_contract[name] = errors[name]
+            continue
+        try:
+            if confirmed_block >= from_block:
+                mark_scanned(conn, address, from_block, confirmed_block)
+            logs_by_contract[name] = load_logs(conn, address, from_block, to_block)
+        except Exception as e:
+            logs_by_contract[name] = e
+    conn.close()
+    return logs_by_contract
+
+SECTION_NUMBERS = ["1️⃣", "2️⃣", "3️⃣", "4️⃣", "5️⃣"]
+RATE_LABELS = {"nft": "Mints", "score": "Updates", "registry": "Interactions"}
+TOTAL_LABELS = {"nft": "🎨 NFT Contract", "score": "📊 Score Contract", "registry": "⛓️ Registry Contract"}
+
+@dataclass(slots=True)
+class ContractStats:
+    """Kennzahlen eines Contracts, komplett aus einem get_logs Ergebnis berechnet"""
+    total: int  # alle Events des Contracts
+    events: int  # relevante Events (NFT: Transfers)
+    mints: int = 0
+    first_block: Optional[int] = None  # NFT: erster/letzter Mint
+    last_block: Optional[int] = None
+    first_ts: Optional[int] = None
+    last_ts: Optional[int] = None
+    last_tx: Optional[str] = None
+    last_token_id: Optional[int] = None
+    max_token_id: Optional[int] = None
+    unique_tokens: int = 0
+    last_recipient: Optional[str] = None
+    unique_recipients: int = 0
+    unique_txs: int = 0
+    interactions: int = 0
+    unique_interaction_users: int = 0
+
+def analyze_contract(kind, logs):
+    """Berechnet alle Kennzahlen eines Contracts ohne weitere RPC-Calls"""
+    if kind == "nft":
+        # Alle Events geladen (für die Gesamtstatistik), Transfers lokal filtern
+        relevant = [log for log in logs if log['topics'] and log['topics'][0] == TRANSFER_TOPIC_BYTES]
+        stats = ContractStats(total=len(logs), events=len(relevant))
+        if relevant:
+            # Mints (from = 0x0) + Empfänger vektorisiert: topics[1]/[2] als (N, 32) uint8 Arrays
+            from_topics = np.frombuffer(b''.join(log['topics'][1] for log in relevant), dtype=np.uint8).reshape(-1, 32)
+            to_topics = np.frombuffer(b''.join(log['topics'][2] for log in relevant), dtype=np.uint8).reshape(-1, 32)
+            mint_mask = ~from_topics.any(axis=1)
+            relevant = [relevant[i] for i in np.flatnonzero(mint_mask)]
+            stats.mints = len(relevant)
+            # Adresse = letzte 20 Bytes des Topics, direkt als Bytes (kein Hex-Umweg)
+            recipients = to_topics[mint_mask, 12:]
+            stats.unique_recipients = np.unique(recipients, axis=0).shape[0]
+        if relevant:
+            # Token IDs (topics[3]) als 4 big-endian uint64 Wörter pro Log decodieren
+            token_words = np.frombuffer(b''.join(log['topics'][3] for log in relevant), dtype='>u8').reshape(-1, 4)
+            if token_words[:, :3].any():
+                # IDs >= 2^64 passen nicht in uint64
+                token_ids = [int.from_bytes(log['topics'][3], byteorder='big') for log in relevant]
+                stats.max_token_id = max(token_ids)
+                stats.unique_tokens = len(set(token_ids))
+            else:
+                token_ids = token_words[:, 3]
+                stats.max_token_id = int(token_ids.max())
+                stats.unique_tokens = np.unique(token_ids).size
+            stats.last_token_id = int(token_ids[-1])
+            stats.last_recipient = '0x' + recipients[-1].tobytes().hex()
+    else:
+        relevant = logs
+        stats = ContractStats(total=len(logs), events=len(logs))
+        stats.unique_txs = len(set(log['transactionHash'] for log in logs))
         
-        # Decode token ID from topics[3]
-        token_id = int.from_bytes(last_mint['topics'][3], byteorder='big')
-        print(f"   Token ID: #{token_id}")
+        if kind == "registry":
+            # InteractionRecorded Events über topic0 (DashboardLinkRegistered hat nur 3 Topics,
+            # andere Events mit 4 Topics würden bei len()-Filter mitgezählt)
+            interaction_events = [log for log in logs if log['topics'] and log['topics'][0] == INTERACTION_TOPIC_BYTES]
+            stats.interactions = len(interaction_events)
+            if interaction_events:
+                # Topics[1] = initiator, Topics[2] = responder → ein (2N, 32) Array, Adresse = letzte 20 Bytes
+                participant_topics = np.frombuffer(
+                    b''.join(topic for event in interaction_events for topic in event['topics'][1:3]),
+                    dtype=np.uint8
+                ).reshape(-1, 32)
+                stats.unique_interaction_users = np.unique(participant_topics[:, 12:], axis=0).shape[0]
+    
+    if relevant:
+        stats.first_block = relevant[0]['blockNumber']
+        stats.last_block = relevant[-1]['blockNumber']
+        stats.last_tx = relevant[-1]['transactionHash'].hex()
+    return stats
+
+def print_contract_stats(number, contract, from_block, latest_block, stats):
+    """Ein Contract-Abschnitt - Vorlage für alle Contract-Typen"""
+    kind = contract["kind"]
+    print("\n" + "=" * 80)
+    print(f"{SECTION_NUMBERS[number]} {contract['name'].upper()} CONTRACT")
+    print("=" * 80)
+    
+    print(f"📍 Address: {contract['address']}")
+    print(f"🔍 Scanning blocks {from_block:,} → {latest_block:,} ({latest_block - from_block:,} blocks)")
+    
+    if isinstance(stats, Exception):
+        print(f"❌ Fehler: {stats}")
+        return
+    
+    if kind == "nft":
+        print(f"\n📊 Total Transfer Events: {stats.events}")
+        print(f"🎨 NFTs Minted: {stats.mints}")
+        first_label, last_label = "Erster Mint", "Letzter Mint"
+    else:
+        print(f"\n📊 Total Events: {stats.events}")
+        first_label, last_label = "Erste Aktivität", "Letzte Aktivität"
+    
+    if stats.last_block is not None:
+        first_time = datetime.fromtimestamp(stats.first_ts)
+        last_time = datetime.fromtimestamp(stats.last_ts)
         
-        # Get recipient from topics[2]
-        recipient = '0x' + last_mint['topics'][2].hex()[-40:]
-        print(f"   Empfänger: {recipient}")
-    
-    # Get all unique token holders
-    recipients = set()
-    for mint in mints:
-        recipient = '0x' + mint['topics'][2].hex()[-40:]
-        recipients.add(recipient)
-    
-    print(f"\n👥 Unique NFT Holders: {len(recipients)}")
-    
-except Exception as e:
-    print(f"❌ Fehler: {e}")
-
-print("\n" + "=" * 80)
-print("2️⃣ RESONANCE SCORE CONTRACT")
-print("=" * 80)
-print(f"📍 Address: {RESONANCE_SCORE}")
-
-try:
-    # Get all events from Score Contract
-    logs = w3.eth.get_logs({
-        'address': RESONANCE_SCORE,
-        'fromBlock': from_block,
-        'toBlock': 'latest'
-    })
-    
-    print(f"\n📊 Total Events: {len(logs)}")
-    
-    if logs:
-        # Get last event
-        last_event = logs[-1]
-        last_block_info = w3.eth.get_block(last_event['blockNumber'])
-        last_time = datetime.fromtimestamp(last_block_info['timestamp'])
+        print(f"\n📅 {first_label}:")
+        print(f"   Block: {stats.first_block:,}")
+        print(f"   Zeit: {first_time.strftime('%d.%m.%Y %H:%M:%S')}")
         
-        print(f"\n📅 Letzte Aktivität:")
-        print(f"   Block: {last_event['blockNumber']:,}")
+        print(f"\n📅 {last_label}:")
+        print(f"   Block: {stats.last_block:,}")
         print(f"   Zeit: {last_time.strftime('%d.%m.%Y %H:%M:%S')}")
-        print(f"   TX: {last_event['transactionHash'].hex()}")
+        print(f"   TX: {stats.last_tx}")
+        if kind == "nft":
+            print(f"   Token ID: #{stats.last_token_id}")
+            print(f"   Empfänger: {stats.last_recipient}")
         
-        # Count unique transactions
-        unique_txs = set(log['transactionHash'] for log in logs)
-        print(f"\n📈 Unique Transactions: {len(unique_txs)}")
-        
-except Exception as e:
-    print(f"❌ Fehler: {e}")
-
-print("\n" + "=" * 80)
-print("3️⃣ RESONANCE REGISTRY CONTRACT")
-print("=" * 80)
-print(f"📍 Address: {RESONANCE_REGISTRY}")
-
-try:
-    # Get all events from Registry Contract
-    logs = w3.eth.get_logs({
-        'address': RESONANCE_REGISTRY,
-        'fromBlock': from_block,
-        'toBlock': 'latest'
-    })
-    
-    print(f"\n📊 Total Events: {len(logs)}")
-    
-    if logs:
-        # Get last event
-        last_event = logs[-1]
-        last_block_info = w3.eth.get_block(last_event['blockNumber'])
-        last_time = datetime.fromtimestamp(last_block_info['timestamp'])
-        
-        print(f"\n📅 Letzte Aktivität:")
-        print(f"   Block: {last_event['blockNumber']:,}")
-        print(f"   Zeit: {last_time.strftime('%d.%m.%Y %H:%M:%S')}")
-        print(f"   TX: {last_event['transactionHash'].hex()}")
+        hours = (datetime.now() - last_time).total_seconds() / 3600
+        print(f"   ⏱️ Vor {hours:.1f} Stunden")
+    
+    if kind == "nft":
+        print(f"\n👥 Unique NFT Holders: {stats.unique_recipients}")
+        if stats.max_token_id is not None:
+            print(f"🔢 Höchste Token ID: #{stats.max_token_id} ({stats.unique_tokens} verschiedene Tokens)")
+        rate_events = stats.mints
+    else:
+        if stats.last_block is not None:
+            print(f"\n📈 Unique Transactions: {stats.unique_txs}")
+        if kind == "registry" and stats.last_block is not None:
+            print(f"⛓️ InteractionRecorded Events: {stats.interactions}")
+            if stats.interactions:
+                print(f"👥 Unique Users mit Interactions: {stats.unique_interaction_users}")
+        rate_events = stats.events
+    
+    # Events pro Tag
+    if stats.last_block is not None:
+        time_span_days = (stats.last_ts - stats.first_ts) / 86400
+        if time_span_days > 0:
+            print(f"📈 {RATE_LABELS[kind]}/Tag (Durchschnitt): {rate_events / time_span_days:.1f}")
+
+def contract_ranges(contracts, latest_block):
+    """
+    {name: (address, from_block)} für fetch_logs_parallel
+    latest_block wird einmal gelesen und als feste Zahl übergeben (konsistenter Snapshot)
+    """
+    return {
+        contract["name"]: (
+            contract["address"],
+            contract.get("from_block", max(latest_block - DEFAULT_BLOCK_WINDOW, contract.get("deploy_block", 0)))
+        )
+        for contract in contracts
+    }
+
+def run_analysis(contracts):
+    """Analysiert alle Contracts: Logs parallel laden, Timestamps in einem Batch"""
+    print("=" * 80)
+    print("📊 AERA SMART CONTRACTS - VOLLSTÄNDIGE ANALYSE")
+    print("=" * 80)
+    print(f"\n🌐 Verbunden mit: {RPC_URL}")
+    print(f"✅ Web3 Connected: {w3.is_connected()}")
+    
+    latest_block = w3.eth.block_number
+    print(f"📍 Current Block: {latest_block:,}")
+    
+    ranges = contract_ranges(contracts, latest_block)
+    from_blocks = [ranges[contract["name"]][1] for contract in contracts]
+    
+    # Erst alle Logs laden, dann die benötigten Block-Timestamps in einem Batch
+    logs_by_contract = fetch_logs_parallel(ranges, latest_block)
+    
+    all_stats = []
+    for contract in contracts:
+        logs = logs_by_contract[contract["name"]]
+        all_stats.append(logs if isinstance(logs, Exception) else analyze_contract(contract["kind"], logs))
+    
+    # Erster + letzter Block pro Contract
+    valid_stats = [stats for stats in all_stats if not isinstance(stats, Exception)]
+    needed_blocks = [
+        block
+        for stats in valid_stats if stats.last_block is not None
+        for block in (stats.first_block, stats.last_block)
+    ]
+    # Timestamps ändern sich nie → aus dem Log-Cache, nur fehlende per Batch laden
+    conn = get_log_cache_connection()
+    block_timestamps.update(load_block_timestamps(conn, needed_blocks))
+    try:
+        fetched = get_block_timestamps([block for block in needed_blocks if block not in block_timestamps])
+        block_timestamps.update(fetched)
+        store_block_timestamps(conn, fetched)
+    except Exception as e:
+        print(f"⚠️ Batch-Request fehlgeschlagen, lade Blöcke einzeln: {e}")
+    conn.close()
+    
+    for stats in valid_stats:
+        if stats.last_block is not None:
+            stats.first_ts = block_timestamp(stats.first_block)
+            stats.last_ts = block_timestamp(stats.last_block)
+    
+    for number, (contract, from_block, stats) in enumerate(zip(contracts, from_blocks, all_stats)):
+        print_contract_stats(number, contract, from_block, latest_block, stats)
+    
+    print("\n" + "=" * 80)
+    print("📊 GESAMTSTATISTIK")
+    print("=" * 80)
+    
+    # Stats von oben wiederverwenden, keine neuen Queries
+    errors = [stats for stats in all_stats if isinstance(stats, Exception)]
+    if errors:
+        print(f"❌ Fehler bei Gesamtstatistik: {errors[0]}")
+    else:
+        print()
+        for contract, stats in zip(contracts, all_stats):
+            print(f"{TOTAL_LABELS[contract['kind']]}: {stats.total} events")
+        print(f"\n💫 TOTAL EVENTS: {sum(stats.total for stats in all_stats)}")
         
-        # Count unique transactions
-        unique_txs = set(log['transactionHash'] for log in logs)
-        print(f"\n📈 Unique Transactions: {len(unique_txs)}")
+        print(f"\n🔗 Basescan Links:")
+        for contract in contracts:
+            print(f"   {contract['short']}: https://sepolia.basescan.org/address/{contract['address']}")
+    
+    print("\n" + "=" * 80)
+    print("✅ ANALYSE ABGESCHLOSSEN")
+    print("=" * 80)
+
+async def follow_logs(contracts):
+    """
+    Neue Events per eth_subscribe("logs") empfangen (Push statt erneutem
+    eth_getLogs über den ganzen Bereich) und inkrementell cachen.
+    """
+    by_address = {contract["address"].lower(): contract for contract in contracts}
+    
+    print("\n" + "=" * 80)
+    print("🔔 LIVE-MODUS - warte auf neue Events (Ctrl+C zum Beenden)")
+    print("=" * 80)
+    print(f"🌐 WebSocket: {WS_URL}")
+    
+    async with websockets.connect(WS_URL) as ws:
+        await ws.send(json.dumps({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "eth_subscribe",
+            "params": ["logs", {"address": [contract["address"] for contract in contracts]}]
+        }))
+        reply = json.loads(await ws.recv())
+        if "error" in reply:
+            raise RuntimeError(f"eth_subscribe: {reply['error']}")
         
-        # Try to identify InteractionRecorded events (4 topics)
-        interaction_events = [log for log in logs if len(log['topics']) == 4]
-        print(f"⛓️ InteractionRecorded Events: {len(interaction_events)}")
+        # Subscription läuft → Lücke seit dem Snapshot einmal per eth_getLogs schließen
+        latest_block = await asyncio.to_thread(lambda: w3.eth.block_number)
+        await asyncio.to_thread(fetch_logs_parallel, contract_ranges(contracts, latest_block), latest_block)
+        # Gescannt ist nur bis zur Bestätigungsgrenze; Reorgs danach meldet die Subscription (removed)
+        synced = {address: latest_block - CONFIRMATIONS for address in by_address}
         
-except Exception as e:
-    print(f"❌ Fehler: {e}")
-
-print("\n" + "=" * 80)
-print("📊 GESAMTSTATISTIK")
-print("=" * 80)
-
-# Calculate total activity
-total_nft_events = len(w3.eth.get_logs({
-    'address': IDENTITY_NFT,
-    'fromBlock': from_block,
-    'toBlock': 'latest'
-}))
-
-total_score_events = len(w3.eth.get_logs({
-    'address': RESONANCE_SCORE,
-    'fromBlock': from_block,
-    'toBlock': 'latest'
-}))
-
-total_registry_events = len(w3.eth.get_logs({
-    'address': RESONANCE_REGISTRY,
-    'fromBlock': from_block,
-    'toBlock': 'latest'
-}))
-
-total_events = total_nft_events + total_score_events + total_registry_events
-
-print(f"\n🎨 NFT Contract: {total_nft_events} events")
-print(f"📊 Score Contract: {total_score_events} events")
-print(f"⛓️ Registry Contract: {total_registry_events} events")
-print(f"\n💫 TOTAL EVENTS: {total_events}")
-
-print("\n" + "=" * 80)
-print("✅ ANALYSE ABGESCHLOSSEN")
-print("=" * 80)
+        conn = get_log_cache_connection()
+        try:
+            async for message in ws:
+                log = json.loads(message).get("params", {}).get("result")
+                if not log:
+                    continue
+                address = log["address"].lower()
+                contract = by_address.get(address)
+                if contract is None:
+                    continue
+                
+                block = int(log["blockNumber"], 16)
+                log_index = int(log["logIndex"], 16)
+                if log.get("removed"):
+                    # Chain-Reorganisation: Event ist nicht mehr Teil der Chain
+                    remove_log(conn, address, block, log_index)
+                    print(f"↩️ {contract['name']}: Event in Block {block:,} entfernt (Reorg)")
+                    continue
+                
+                store_logs(conn, address, [parse_rpc_log(log)], min(synced[address] + 1, block), block)
+                synced[address] = max(synced[address], block)
+                print(f"🔔 {contract['name']}: Block {block:,} - TX {log['transactionHash']}")
+        finally:
+            conn.close()
+
+def main(contracts):
+    run_analysis(contracts)
+    
+    if "--follow" in sys.argv:
+        try:
+            asyncio.run(follow_logs(contracts))
+        except KeyboardInterrupt:
+            print("\n⏹️ Live-Modus beendet")
+
+if __name__ == "__main__":
+    main(CONTRACTS)
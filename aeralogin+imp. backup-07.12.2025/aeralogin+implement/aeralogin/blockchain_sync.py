@@ -7,16 +7,66 @@ Background service to sync scores from database to blockchain
 """
 
 import asyncio
+import os
 import sqlite3
-from typing import Optional, Dict, Any
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 from logger import setup_logger
 from web3_service import web3_service
 
 logger = setup_logger(__name__)
 
+@dataclass(slots=True)
+class SyncItem:
+    """Pending score sync for one address"""
+    address: str  # lowercase
+    score: int
+    retries: int = 0
+    timestamp: float = 0.0  # epoch seconds when queued
+
+
+class SyncQueue:
+    """
+    Sync queue keyed on address: a newer score for an address that is still
+    pending replaces the old one instead of sending a second transaction.
+    Addresses are processed in the order they were first queued.
+    """
+    
+    def __init__(self):
+        self._items: Dict[str, SyncItem] = {}  # lowercase address → item
+        self._event = asyncio.Event()
+    
+    def put_nowait(self, item: SyncItem, replace: bool = True):
+        """Queue an item; with replace=False a pending (newer) item for the address wins"""
+        if item.address in self._items and not replace:
+            return
+        self._items[item.address] = item  # keeps the queue position of a pending address
+        self._event.set()
+    
+    async def put(self, item: SyncItem, replace: bool = True):
+        self.put_nowait(item, replace)
+    
+    async def get(self) -> SyncItem:
+        """Oldest pending item (waits until one is queued)"""
+        while not self._items:
+            self._event.clear()
+            await self._event.wait()
+        return self._items.pop(next(iter(self._items)))
+    
+    def empty(self) -> bool:
+        return not self._items
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(list(self._items.values()))
+
+
 # Global sync queue
-sync_queue = asyncio.Queue()
+sync_queue = SyncQueue()
 _sync_processor_task = None
 _is_running = False
 
@@ -24,6 +74,76 @@ _is_running = False
 RETRY_DELAY_SECONDS = 300  # 5 minutes between retries
 MAX_RETRIES = 3
 
+# Persistent DB connection for the queue processor (opened once, WAL mode)
+DB_PATH = os.path.join(os.path.dirname(__file__), "aera.db")
+_db_conn: Optional[sqlite3.Connection] = None
+_db_lock = asyncio.Lock()
+
+
+def _get_sync_db() -> sqlite3.Connection:
+    """Open the sync queue's DB connection on first use and reuse it afterwards"""
+    global _db_conn
+    if _db_conn is None:
+        _db_conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        _db_conn.execute("PRAGMA journal_mode=WAL")
+        _db_conn.execute("PRAGMA synchronous=NORMAL")
+        _db_conn.execute("PRAGMA temp_store=MEMORY")
+        _db_conn.execute("PRAGMA busy_timeout=5000")
+    return _db_conn
+
+
+# Successful syncs are written in batches: one transaction per flush
+DB_FLUSH_BATCH_SIZE = 20
+DB_FLUSH_INTERVAL_SECONDS = 0.2
+_pending_updates: List[Tuple[int, str]] = []  # (score, address)
+_last_flush = 0.0
+
+
+async def _flush_pending_updates():
+    """Write all buffered blockchain_score updates with one executemany + commit"""
+    global _last_flush
+    _last_flush = time.monotonic()
+    if not _pending_updates:
+        return
+    
+    updates = _pending_updates.copy()
+    _pending_updates.clear()
+    try:
+        async with _db_lock:
+            conn = _get_sync_db()
+            conn.execute("BEGIN")
+            try:
+                conn.executemany("""
+                    UPDATE users 
+                    SET blockchain_score = ?,
+                        last_blockchain_sync = CURRENT_TIMESTAMP
+                    WHERE address = ?
+                """, updates)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        logger.info(f"✅ Database updated: blockchain_score for {len(updates)} user(s)")
+    except Exception as db_error:
+        logger.error(f"❌ Failed to update database for {len(updates)} user(s): {db_error}")
+
+
+def _should_flush() -> bool:
+    """Flush when the buffer is full, the queue is drained or the interval has passed"""
+    return (
+        len(_pending_updates) >= DB_FLUSH_BATCH_SIZE
+        or sync_queue.empty()
+        or time.monotonic() - _last_flush >= DB_FLUSH_INTERVAL_SECONDS
+    )
+
+
+def _close_sync_db():
+    """Close the persistent DB connection (on processor shutdown)"""
+    global _db_conn
+    if _db_conn is not None:
+        _db_conn.close()
+        _db_conn = None
+
 
 async def sync_score_after_update(address: str, score: int, conn: Optional[sqlite3.Connection] = None):
     """
@@ -215,12 +335,7 @@ async def add_to_sync_queue(address: str, score: int):
         score: Score to sync
     """
     try:
-        await sync_queue.put({
-            "address": address,
-            "score": score,
-            "timestamp": datetime.now().isoformat(),
-            "retries": 0
-        })
+        await sync_queue.put(SyncItem(address.lower(), score, 0, time.time()))
         logger.info(f"📋 Added to sync queue: {address} → {score}")
     except Exception as e:
         logger.error(f"Error adding {address} to sync queue: {e}")
@@ -241,11 +356,12 @@ async def process_sync_queue():
             try:
                 item = await asyncio.wait_for(sync_queue.get(), timeout=10.0)
             except asyncio.TimeoutError:
+                await _flush_pending_updates()
                 continue  # No items, continue loop
             
-            address = item["address"]
-            score = item["score"]
-            retries = item.get("retries", 0)
+            address = item.address
+            score = item.score
+            retries = item.retries
             
             logger.info(f"📊 Processing sync queue item: {address} → {score} (attempt {retries + 1})")
             
@@ -255,44 +371,31 @@ async def process_sync_queue():
             if success:
                 logger.info(f"✅ Sync successful: {result.get('tx_hash')}")
                 
-                # Update database blockchain_score and sync timestamp
-                try:
-                    import sqlite3
-                    import os
-                    DB_PATH = os.path.join(os.path.dirname(__file__), "aera.db")
-                    conn = sqlite3.connect(DB_PATH)
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        UPDATE users 
-                        SET blockchain_score = ?,
-                            last_blockchain_sync = CURRENT_TIMESTAMP
-                        WHERE address = ?
-                    """, (score, address.lower()))
-                    conn.commit()
-                    conn.close()
-                    logger.info(f"✅ Database updated: blockchain_score={score} for {address[:10]}...")
-                except Exception as db_error:
-                    logger.error(f"❌ Failed to update database for {address}: {db_error}")
+                # Update database blockchain_score and sync timestamp (batched)
+                _pending_updates.append((score, address))
+                if _should_flush():
+                    await _flush_pending_updates()
             else:
                 logger.error(f"❌ Sync failed: {result.get('error')}")
                 
                 # Retry logic
                 if retries < MAX_RETRIES:
-                    item["retries"] = retries + 1
-                    # Re-add to queue after delay
+                    # Don't hold buffered updates back during the retry delay
+                    await _flush_pending_updates()
+                    item.retries = retries + 1
+                    # Re-add to queue after delay (a newer score queued meanwhile wins)
                     await asyncio.sleep(RETRY_DELAY_SECONDS)
-                    await sync_queue.put(item)
+                    await sync_queue.put(item, replace=False)
                     logger.info(f"♻️ Re-queued for retry: {address}")
                 else:
                     logger.error(f"❌ Max retries reached for {address}, giving up")
             
-            # Mark task as done
-            sync_queue.task_done()
-            
         except Exception as e:
             logger.error(f"Error processing sync queue: {e}")
             await asyncio.sleep(1)  # Brief pause on error
     
+    await _flush_pending_updates()
+    _close_sync_db()
     logger.info("🛑 Score sync queue processor stopped")
 
 
@@ -326,4 +429,6 @@ async def stop_sync_queue_processor():
         except asyncio.CancelledError:
             pass
         
+        await _flush_pending_updates()
+        _close_sync_db()
         logger.info("✅ Sync queue processor stopped")
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 """Bulk Score Sync - Alle User-Scores auf Blockchain synchronisieren"""
+import asyncio
 import sqlite3
-from web3 import Web3
+import orjson
+from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
+from eth_account import Account
 from dotenv import load_dotenv
 import os
 import json
 import time
 from datetime import datetime
+from functools import lru_cache
 
 load_dotenv()
 
@@ -15,21 +19,74 @@ rpc_url = "https://sepolia.base.org"
 score_address = "0xD4676a88bfAD40A87c8a5e889EE4AdD1448527c4"
 backend_key = os.getenv("BACKEND_PRIVATE_KEY")
 db_path = "aera.db"
+MAX_CONCURRENT_USERS = 8  # gleichzeitige Receipt-Abfragen
+MULTICALL_BATCH_SIZE = 500  # getResonance Calls pro Multicall3 eth_call
+SENDS_PER_SECOND = 20  # Token-Bucket für send_raw_transaction (Bursts bis zu diesem Wert)
+MAX_SEND_RETRIES = 5  # bei HTTP 429 / -32005 mit Backoff min(60, 2**retry) Sekunden
+MIN_PRIORITY_FEE = Web3.to_wei(0.001, 'gwei')  # Untergrenze für maxPriorityFeePerGas (Base: Base Fee ~0.001 gwei)
 
-w3 = Web3(Web3.HTTPProvider(rpc_url))
-account = w3.eth.account.from_key(backend_key)
+class OrjsonAsyncHTTPProvider(AsyncHTTPProvider):
+    """AsyncHTTPProvider, der Antworten mit orjson statt json decodiert"""
+    def decode_rpc_response(self, raw_response):
+        return orjson.loads(raw_response)
+
+# Async Provider: RPCs verschiedener User laufen überlappend statt nacheinander
+w3 = AsyncWeb3(OrjsonAsyncHTTPProvider(rpc_url))
+# Ein Event Loop für das ganze Skript (die aiohttp Session des Providers hängt am Loop)
+loop = asyncio.new_event_loop()
+account = Account.from_key(backend_key)
 
 # ABI mit adminAdjust und getResonance
 abi = json.loads('[{"inputs":[{"internalType":"address","name":"user","type":"address"},{"internalType":"uint256","name":"newAmount","type":"uint256"}],"name":"adminAdjust","outputs":[],"stateMutability":"nonpayable","type":"function"},{"inputs":[{"internalType":"address","name":"user","type":"address"}],"name":"getResonance","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}]')
 
 contract = w3.eth.contract(address=score_address, abi=abi)
 
+# Multicall3 (gleiche Adresse auf BASE Mainnet + BASE Sepolia)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+GET_RESONANCE_SELECTOR = Web3.keccak(text="getResonance(address)")[:4]
+
+def get_resonance_call_data(wallet):
+    """Calldata für getResonance(wallet): Selector + linksbündig genullte Adresse"""
+    return GET_RESONANCE_SELECTOR + bytes(12) + bytes.fromhex(wallet[2:])
+
+# EIP-55 (keccak) nur einmal pro Wallet - jede Wallet wird mehrfach gebraucht
+to_checksum = lru_cache(maxsize=100_000)(Web3.to_checksum_address)
+
 print("🚀 BULK SCORE SYNC - ALLE USER")
 print("=" * 80)
 print(f"⏰ Start: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print(f"📊 Contract: {score_address}")
 print(f"💼 Backend:  {account.address}")
-print(f"💰 Balance:  {w3.eth.get_balance(account.address) / 1e18:.6f} ETH")
+print(f"💰 Balance:  {loop.run_until_complete(w3.eth.get_balance(account.address)) / 1e18:.6f} ETH")
 print("=" * 80)
 
 # Hole alle User aus DB
@@ -53,21 +110,103 @@ stats = {
 
 results = []
 
-# Prozessiere jeden User
-for idx, (wallet, db_score) in enumerate(users, 1):
-    print(f"\n{'─' * 80}")
-    print(f"[{idx}/{len(users)}] 👤 {wallet}")
-    print(f"    📊 DB Score: {db_score}")
+async def bounded(semaphore, coro):
+    """Coroutine in einem Semaphore-Slot ausführen"""
+    async with semaphore:
+        return await coro
+
+class TokenBucket:
+    """Erlaubt bis zu `rate` Calls pro Sekunde, ungenutzte Tokens für Bursts bis `capacity`"""
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
     
-    try:
-        # Prüfe aktuellen Blockchain-Score
-        checksum_addr = Web3.to_checksum_address(wallet)
-        current_score = contract.functions.getResonance(checksum_addr).call()
-        print(f"    ⛓️  Chain Score: {current_score}")
-        
-        # Skip wenn Score bereits korrekt ist
-        if current_score == db_score:
-            print(f"    ⏭️  SKIP - Score bereits synchronisiert")
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+send_limiter = TokenBucket(SENDS_PER_SECOND)
+
+def is_rate_limited(error):
+    """HTTP 429 vom RPC oder JSON-RPC -32005 (limit exceeded)"""
+    message = str(error)
+    return "429" in message or "-32005" in message or "rate limit" in message.lower()
+
+async def send_with_backoff(raw_tx):
+    """send_raw_transaction über den Token-Bucket, bei Rate-Limits exponentieller Backoff"""
+    for retry in range(MAX_SEND_RETRIES + 1):
+        await send_limiter.acquire()
+        try:
+            return await w3.eth.send_raw_transaction(raw_tx)
+        except Exception as e:
+            if retry == MAX_SEND_RETRIES or not is_rate_limited(e):
+                raise
+            delay = min(60, 2 ** retry)
+            print(f"    ⏳ Rate-Limit erreicht, neuer Versuch in {delay}s...")
+            await asyncio.sleep(delay)
+
+def record_error(wallet, db_score, error):
+    """Fehler für einen User in Statistik + Report übernehmen"""
+    print(f"    ❌ {wallet}: Error: {str(error)[:100]}")
+    stats['failed'] += 1
+    results.append({
+        'wallet': wallet,
+        'status': 'error',
+        'db_score': db_score,
+        'error': str(error)[:200]
+    })
+
+async def read_chain_scores(wallets):
+    """
+    getResonance für alle Wallets über Multicall3 aggregate3
+    (ein eth_call pro MULTICALL_BATCH_SIZE Wallets) → Score oder Exception pro Wallet
+    """
+    batches = [wallets[i:i + MULTICALL_BATCH_SIZE] for i in range(0, len(wallets), MULTICALL_BATCH_SIZE)]
+    responses = await asyncio.gather(*[
+        multicall.functions.aggregate3([
+            (score_address, True, get_resonance_call_data(wallet))
+            for wallet in batch
+        ]).call()
+        for batch in batches
+    ], return_exceptions=True)
+    
+    scores = []
+    for batch, response in zip(batches, responses):
+        if isinstance(response, Exception):
+            scores += [response] * len(batch)
+            continue
+        for success, return_data in response:
+            if success:
+                scores.append(int.from_bytes(return_data, 'big'))
+            else:
+                scores.append(RuntimeError("getResonance reverted"))
+    return scores
+
+async def sync_all_users():
+    """
+    1. Chain-Scores aller User per Multicall3 lesen → Skip-Liste
+    2. Nonce + EIP-1559 Fees EINMAL holen, alle adminAdjust TXs lokal signieren
+    3. In Nonce-Reihenfolge senden (Token-Bucket), ohne zwischendurch auf Receipts zu warten
+    4. Alle Receipts parallel abwarten, danach Scores verifizieren
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_USERS)
+    
+    print("🔍 Lese Chain-Scores...")
+    chain_scores = await read_chain_scores([wallet for wallet, _ in users])
+    
+    to_sync = []
+    for (wallet, db_score), current_score in zip(users, chain_scores):
+        if isinstance(current_score, Exception):
+            record_error(wallet, db_score, current_score)
+        elif current_score == db_score:
             stats['skipped'] += 1
             results.append({
                 'wallet': wallet,
@@ -75,39 +214,80 @@ for idx, (wallet, db_score) in enumerate(users, 1):
                 'db_score': db_score,
                 'chain_score': current_score
             })
-            continue
-        
-        # adminAdjust Transaction bauen
-        nonce = w3.eth.get_transaction_count(account.address)
-        tx = contract.functions.adminAdjust(checksum_addr, db_score).build_transaction({
+        else:
+            print(f"    👤 {wallet}: DB {db_score} ≠ Chain {current_score}")
+            to_sync.append((wallet, db_score))
+    
+    print(f"    ⏭️  {stats['skipped']} bereits synchronisiert, {len(to_sync)} zu aktualisieren")
+    if not to_sync:
+        return
+    
+    # Nonces lokal hochzählen statt get_transaction_count pro User
+    base_nonce, fee_history, chain_id = await asyncio.gather(
+        w3.eth.get_transaction_count(account.address, 'pending'),
+        w3.eth.fee_history(5, 'latest', [50]),
+        w3.eth.chain_id
+    )
+    # EIP-1559: Base Fee des nächsten Blocks + Median-Tip; zu viel Geboten wird nicht bezahlt
+    base_fee = fee_history['baseFeePerGas'][-1]
+    priority_fee = max(fee_history['reward'][-1][0], MIN_PRIORITY_FEE)
+    max_fee = 2 * base_fee + priority_fee
+    
+    signed = []
+    for offset, (wallet, db_score) in enumerate(to_sync):
+        tx = await contract.functions.adminAdjust(to_checksum(wallet), db_score).build_transaction({
             'from': account.address,
-            'nonce': nonce,
+            'nonce': base_nonce + offset,
             'gas': 150000,
-            'gasPrice': w3.eth.gas_price,
+            'maxFeePerGas': max_fee,
+            'maxPriorityFeePerGas': priority_fee,
+            'type': 2,
+            'chainId': chain_id,
         })
-        
-        # Signieren und senden
-        signed_tx = w3.eth.account.sign_transaction(tx, backend_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-        
+        signed.append(Account.sign_transaction(tx, backend_key).rawTransaction)
+    
+    print(f"\n📤 Sende {len(signed)} Transactions (Nonce {base_nonce}-{base_nonce + len(signed) - 1})...")
+    sent = []
+    for (wallet, db_score), raw_tx in zip(to_sync, signed):
+        try:
+            sent.append((wallet, db_score, await send_with_backoff(raw_tx)))
+        except Exception as e:
+            record_error(wallet, db_score, e)
+            break
+    
+    # Nach einem Sendefehler würden alle höheren Nonces hängen bleiben
+    for wallet, db_score in to_sync[len(sent) + 1:]:
+        record_error(wallet, db_score, "Nicht gesendet - vorherige Transaction fehlgeschlagen")
+    
+    print(f"⏳ Warte auf {len(sent)} Bestätigung(en)...")
+    receipts = await asyncio.gather(*[
+        bounded(semaphore, w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120))
+        for _, _, tx_hash in sent
+    ], return_exceptions=True)
+    
+    # Verify neue Scores
+    new_scores = await read_chain_scores([wallet for wallet, _, _ in sent])
+    
+    for (wallet, db_score, tx_hash), receipt, new_score in zip(sent, receipts, new_scores):
+        print(f"\n{'─' * 80}")
+        print(f"👤 {wallet}")
+        print(f"    📊 DB Score: {db_score}")
         print(f"    📤 TX: {tx_hash.hex()}")
-        print(f"    ⏳ Warte auf Bestätigung...", end='', flush=True)
         
-        # Warte auf Receipt
-        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+        if isinstance(receipt, Exception):
+            record_error(wallet, db_score, receipt)
+            continue
         
         if receipt['status'] == 1:
             gas_used = receipt['gasUsed']
-            eth_spent = gas_used * tx['gasPrice'] / 1e18
+            eth_spent = gas_used * receipt['effectiveGasPrice'] / 1e18
             stats['gas_used'] += gas_used
             stats['eth_spent'] += eth_spent
             
-            print(f" ✅ SUCCESS!")
+            print(f"    ✅ SUCCESS!")
             print(f"    ⛽ Gas: {gas_used:,} (~{eth_spent:.6f} ETH)")
             print(f"    🔗 https://sepolia.basescan.org/tx/{tx_hash.hex()}")
             
-            # Verify neuer Score
-            new_score = contract.functions.getResonance(checksum_addr).call()
             if new_score == db_score:
                 print(f"    ✅ Score verified: {new_score}")
                 stats['success'] += 1
@@ -126,11 +306,11 @@ for idx, (wallet, db_score) in enumerate(users, 1):
                     'wallet': wallet,
                     'status': 'mismatch',
                     'db_score': db_score,
-                    'chain_score': new_score,
+                    'chain_score': None if isinstance(new_score, Exception) else new_score,
                     'tx_hash': tx_hash.hex()
                 })
         else:
-            print(f" ❌ FAILED!")
+            print(f"    ❌ FAILED!")
             stats['failed'] += 1
             results.append({
                 'wallet': wallet,
@@ -138,20 +318,8 @@ for idx, (wallet, db_score) in enumerate(users, 1):
                 'db_score': db_score,
                 'tx_hash': tx_hash.hex()
             })
-        
-        # Kleine Pause zwischen Transactions
-        if idx < len(users):
-            time.sleep(2)
-            
-    except Exception as e:
-        print(f"    ❌ Error: {str(e)[:100]}")
-        stats['failed'] += 1
-        results.append({
-            'wallet': wallet,
-            'status': 'error',
-            'db_score': db_score,
-            'error': str(e)[:200]
-        })
+
+loop.run_until_complete(sync_all_users())
 
 # Final Report
 print("\n" + "=" * 80)
@@ -169,7 +337,7 @@ print(f"   Total ETH:      {stats['eth_spent']:.6f} ETH")
 print(f"   Avg Gas/TX:     {stats['gas_used'] // max(stats['success'], 1):,}")
 
 # Backend Balance nach Sync
-final_balance = w3.eth.get_balance(account.address) / 1e18
+final_balance = loop.run_until_complete(w3.eth.get_balance(account.address)) / 1e18
 print(f"\n💰 BACKEND WALLET:")
 print(f"   Vorher:         0.019956 ETH")
 print(f"   Nachher:        {final_balance:.6f} ETH")
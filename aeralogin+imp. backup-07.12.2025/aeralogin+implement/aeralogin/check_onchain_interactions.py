@@ -3,6 +3,11 @@
 Check all onchain interactions from BASE Mainnet Registry
 """
 import os
+from datetime import datetime
+import requests
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 from dotenv import load_dotenv
 
@@ -11,72 +16,108 @@ load_dotenv()
 RPC_URL = os.getenv("BASE_SEPOLIA_RPC_URL")
 REGISTRY_ADDRESS = os.getenv("REGISTRY_ADDRESS")
 
-w3 = Web3(Web3.HTTPProvider(RPC_URL))
+# Eine Keep-Alive Session für alle Calls (kein neuer TCP/TLS Handshake pro eth_call)
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 502, 503, 504], allowed_methods=None)
+))
+w3 = Web3(Web3.HTTPProvider(RPC_URL, session=session, request_kwargs={"timeout": 30}))
 
-# Registry ABI - minimal for reading interactions
-REGISTRY_ABI = [
-    {
-        "inputs": [],
-        "name": "getTotalInteractions",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [{"name": "index", "type": "uint256"}],
-        "name": "getInteraction",
-        "outputs": [{
-            "components": [
-                {"name": "follower", "type": "address"},
-                {"name": "creator", "type": "address"},
-                {"name": "linkId", "type": "bytes32"},
-                {"name": "actionType", "type": "uint8"},
-                {"name": "weightFollower", "type": "uint256"},
-                {"name": "weightCreator", "type": "uint256"},
-                {"name": "timestamp", "type": "uint256"}
-            ],
-            "name": "",
-            "type": "tuple"
-        }],
-        "stateMutability": "view",
-        "type": "function"
-    },
+# EIP-55 Checksum (keccak) pro Adresse nur einmal berechnen
+to_checksum = lru_cache(maxsize=100_000)(Web3.to_checksum_address)
+
+# Registry Selectors einmal beim Import berechnen (kein ABI-Encoding pro Call)
+GET_TOTAL_INTERACTIONS_SELECTOR = bytes(Web3.keccak(text="getTotalInteractions()")[:4])
+GET_INTERACTION_SELECTOR = bytes(Web3.keccak(text="getInteraction(uint256)")[:4])
+GET_USER_INTERACTIONS_SELECTOR = bytes(Web3.keccak(text="getUserInteractions(address)")[:4])
+
+# Multicall3 (gleiche Adresse auf BASE Mainnet + BASE Sepolia)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [
     {
-        "inputs": [{"name": "user", "type": "address"}],
-        "name": "getUserInteractions",
-        "outputs": [{
-            "components": [
-                {"name": "follower", "type": "address"},
-                {"name": "creator", "type": "address"},
-                {"name": "linkId", "type": "bytes32"},
-                {"name": "actionType", "type": "uint8"},
-                {"name": "weightFollower", "type": "uint256"},
-                {"name": "weightCreator", "type": "uint256"},
-                {"name": "timestamp", "type": "uint256"}
-            ],
-            "name": "",
-            "type": "tuple[]"
-        }],
-        "stateMutability": "view",
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
         "type": "function"
     }
 ]
 
+# Rückgabetyp von getInteraction / getUserInteractions
+INTERACTION_TYPE = "(address,address,bytes32,uint8,uint256,uint256,uint256)"
+ACTION_TYPES = ["FOLLOW", "LIKE", "COMMENT", "SHARE", "REFERRAL"]
+
 print("=" * 80)
 print("🔍 ONCHAIN INTERACTION CHECK - BASE MAINNET")
 print("=" * 80)
 print(f"\n📍 Registry Contract: {REGISTRY_ADDRESS}")
 print(f"🌐 RPC: {RPC_URL}")
 
-contract = w3.eth.contract(
-    address=Web3.to_checksum_address(REGISTRY_ADDRESS),
-    abi=REGISTRY_ABI
-)
+registry_address = to_checksum(REGISTRY_ADDRESS)
+multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+
+def multicall_decode(calls):
+    """
+    Alle (callData, Rückgabetyp) Paare in EINEM aggregate3 eth_call
+    → decodierter Wert oder Exception pro Call
+    """
+    if not calls:
+        return []
+    responses = multicall.functions.aggregate3([
+        (registry_address, True, call_data) for call_data, _ in calls
+    ]).call()
+    results = []
+    for (_, return_type), (success, return_data) in zip(calls, responses):
+        if not success:
+            results.append(RuntimeError("call reverted"))
+            continue
+        try:
+            results.append(w3.codec.decode([return_type], return_data)[0])
+        except Exception as e:
+            results.append(e)
+    return results
 
 try:
-    total = contract.functions.getTotalInteractions().call()
+    total = int.from_bytes(w3.eth.call({'to': registry_address, 'data': GET_TOTAL_INTERACTIONS_SELECTOR}), 'big')
     print(f"\n📊 Total Interactions on-chain: {total}")
     
+    # Check specific test wallets
+    test_wallets = [
+        "0x5cfffa13fb26f38b56522ac14ef39c63eb27f42b",
+        "0x41807aa96b12a677cc7919c0068ea8d51763fa72"
+    ]
+    
+    # Letzte 10 Interactions + Test-Wallets in EINEM Multicall3 eth_call
+    start = max(0, total - 10)
+    indices = list(range(start, total))
+    results = multicall_decode(
+        [(GET_INTERACTION_SELECTOR + i.to_bytes(32, 'big'), INTERACTION_TYPE) for i in indices]
+        + [(GET_USER_INTERACTIONS_SELECTOR + bytes(12) + bytes.fromhex(wallet[2:]), f"{INTERACTION_TYPE}[]")
+           for wallet in test_wallets]
+    )
+    interaction_results, wallet_results = results[:len(indices)], results[len(indices):]
+    
     if total == 0:
         print("\n⚠️  NO INTERACTIONS FOUND ON-CHAIN!")
         print("   This means recordInteraction() was never called successfully")
@@ -84,48 +125,33 @@ try:
         print(f"\n📋 Last 10 Interactions:")
         print("=" * 80)
         
-        start = max(0, total - 10)
-        for i in range(start, total):
-            try:
-                interaction = contract.functions.getInteraction(i).call()
-                follower, creator, link_id, action_type, weight_f, weight_c, timestamp = interaction
-                
-                action_types = ["FOLLOW", "LIKE", "COMMENT", "SHARE", "REFERRAL"]
-                action = action_types[action_type] if action_type < len(action_types) else f"UNKNOWN({action_type})"
-                
-                from datetime import datetime
-                time_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
-                
-                print(f"\n{i+1}. {action} | {time_str}")
-                print(f"   Follower: {follower[:10]}... → Creator: {creator[:10]}...")
-                print(f"   Weights: Follower={weight_f}, Creator={weight_c}")
-                
-            except Exception as e:
-                print(f"\n{i+1}. Error reading interaction: {e}")
-    
-    # Check specific test wallets
-    test_wallets = [
-        "0x5cfffa13fb26f38b56522ac14ef39c63eb27f42b",
-        "0x41807aa96b12a677cc7919c0068ea8d51763fa72"
-    ]
+        for i, interaction in zip(indices, interaction_results):
+            if isinstance(interaction, Exception):
+                print(f"\n{i+1}. Error reading interaction: {interaction}")
+                continue
+            follower, creator, link_id, action_type, weight_f, weight_c, timestamp = interaction
+            
+            action = ACTION_TYPES[action_type] if action_type < len(ACTION_TYPES) else f"UNKNOWN({action_type})"
+            time_str = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+            
+            print(f"\n{i+1}. {action} | {time_str}")
+            print(f"   Follower: {follower[:10]}... → Creator: {creator[:10]}...")
+            print(f"   Weights: Follower={weight_f}, Creator={weight_c}")
     
     print("\n" + "=" * 80)
     print("🔍 CHECKING TEST WALLETS")
     print("=" * 80)
     
-    for wallet in test_wallets:
-        try:
-            interactions = contract.functions.getUserInteractions(wallet).call()
-            print(f"\n👤 {wallet[:10]}... has {len(interactions)} interactions")
-            
-            for idx, interaction in enumerate(interactions[:5], 1):
-                follower, creator, link_id, action_type, weight_f, weight_c, timestamp = interaction
-                action_types = ["FOLLOW", "LIKE", "COMMENT", "SHARE", "REFERRAL"]
-                action = action_types[action_type]
-                print(f"   {idx}. {action} | Follower: {follower[:10]}... | Creator: {creator[:10]}...")
-                
-        except Exception as e:
-            print(f"\n👤 {wallet[:10]}... - Error: {e}")
+    for wallet, interactions in zip(test_wallets, wallet_results):
+        if isinstance(interactions, Exception):
+            print(f"\n👤 {wallet[:10]}... - Error: {interactions}")
+            continue
+        print(f"\n👤 {wallet[:10]}... has {len(interactions)} interactions")
+        
+        for idx, interaction in enumerate(interactions[:5], 1):
+            follower, creator, link_id, action_type, weight_f, weight_c, timestamp = interaction
+            action = ACTION_TYPES[action_type] if action_type < len(ACTION_TYPES) else f"UNKNOWN({action_type})"
+            print(f"   {idx}. {action} | Follower: {follower[:10]}... | Creator: {creator[:10]}...")
     
 except Exception as e:
     print(f"\n❌ ERROR: {e}")
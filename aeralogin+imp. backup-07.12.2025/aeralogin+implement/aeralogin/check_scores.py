@@ -1,12 +1,16 @@
-from web3 import Web3
-import json
+import asyncio
+from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
 
-w3 = Web3(Web3.HTTPProvider("https://sepolia.base.org"))
+w3 = AsyncWeb3(AsyncHTTPProvider("https://sepolia.base.org"))
 score_address = "0xD4676a88bfAD40A87c8a5e889EE4AdD1448527c4"
 
-abi = json.loads('[{"inputs":[{"internalType":"address","name":"user","type":"address"}],"name":"getResonance","outputs":[{"internalType":"uint256","name":"","type":"uint256"}],"stateMutability":"view","type":"function"}]')
+# Multicall3 (gleiche Adresse auf BASE Mainnet + BASE Sepolia) - getResonance gebündelt per eth_call
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+MULTICALL3_ABI = [{"inputs":[{"components":[{"name":"target","type":"address"},{"name":"allowFailure","type":"bool"},{"name":"callData","type":"bytes"}],"name":"calls","type":"tuple[]"}],"name":"aggregate3","outputs":[{"components":[{"name":"success","type":"bool"},{"name":"returnData","type":"bytes"}],"name":"returnData","type":"tuple[]"}],"stateMutability":"payable","type":"function"}]
+GET_RESONANCE_SELECTOR = Web3.keccak(text="getResonance(address)")[:4]
+MULTICALL_BATCH_SIZE = 500  # getResonance Calls pro Multicall3 eth_call
 
-contract = w3.eth.contract(address=score_address, abi=abi)
+multicall = w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
 
 # Test Wallets aus dem Sync
 test_wallets = [
@@ -16,13 +20,36 @@ test_wallets = [
     ("0x73f0d7243d546d8abb1364e0adaf1bb926c665d7", 55),
 ]
 
-print("🔍 BLOCKCHAIN SCORE VERIFICATION")
-print("=" * 70)
+# aggregate3 Calls einmal vorbereiten: Selector + gepaddete Adresse direkt aus den
+# Hex-Bytes (kein Checksum-Keccak, kein ABI-Encoding pro Wallet)
+GET_RESONANCE_CALLS = [
+    (score_address, True, GET_RESONANCE_SELECTOR + bytes(12) + bytes.fromhex(wallet[2:]))
+    for wallet, _ in test_wallets
+]
+
+async def read_scores(calls):
+    """Alle Multicall-Batches gleichzeitig → (success, returnData) pro Call"""
+    batches = [calls[i:i + MULTICALL_BATCH_SIZE] for i in range(0, len(calls), MULTICALL_BATCH_SIZE)]
+    responses = await asyncio.gather(*[
+        multicall.functions.aggregate3(batch).call()
+        for batch in batches
+    ])
+    return [result for response in responses for result in response]
+
+async def main():
+    print("🔍 BLOCKCHAIN SCORE VERIFICATION")
+    print("=" * 70)
+
+    results = await read_scores(GET_RESONANCE_CALLS)
+
+    for (wallet, expected), (success, return_data) in zip(test_wallets, results):
+        if not success:
+            print(f"❌ {wallet[:10]}... Expected: {expected}, getResonance reverted")
+            continue
+        score = int.from_bytes(return_data, 'big')
+        status = "✅" if score == expected else "⚠️"
+        print(f"{status} {wallet[:10]}... Expected: {expected}, Got: {score}")
 
-for wallet, expected in test_wallets:
-    checksum = Web3.to_checksum_address(wallet)
-    score = contract.functions.getResonance(checksum).call()
-    status = "✅" if score == expected else "⚠️"
-    print(f"{status} {wallet[:10]}... Expected: {expected}, Got: {score}")
+    print("=" * 70)
 
-print("=" * 70)
+asyncio.run(main())
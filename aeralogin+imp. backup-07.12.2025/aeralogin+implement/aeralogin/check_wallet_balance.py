@@ -1,5 +1,6 @@
 from web3 import Web3
 import os
+import requests
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,9 +10,33 @@ wallet = "0xed1a95ab5b794Dc20964693FBCc60A3DFb5A22C5"
 
 w3 = Web3(Web3.HTTPProvider(rpc_url))
 
-if w3.is_connected():
-    balance_wei = w3.eth.get_balance(wallet)
-    balance_eth = w3.from_wei(balance_wei, 'ether')
+WEI_PER_ETH = 10**18
+WEI_PER_GWEI = 10**9
+
+def read_balance_and_gas_price():
+    """
+    eth_getBalance + eth_gasPrice als EIN JSON-RPC Batch (1 Round-Trip),
+    Fallback auf zwei einzelne Calls, falls der RPC keine Batches kann
+    """
+    try:
+        response = requests.post(rpc_url, json=[
+            {"jsonrpc": "2.0", "id": 0, "method": "eth_getBalance", "params": [wallet, "latest"]},
+            {"jsonrpc": "2.0", "id": 1, "method": "eth_gasPrice", "params": []},
+        ], timeout=10)
+        response.raise_for_status()
+        by_id = {item["id"]: item["result"] for item in response.json()}
+        return int(by_id[0], 16), int(by_id[1], 16)
+    except Exception:
+        return w3.eth.get_balance(wallet), w3.eth.gas_price
+
+try:
+    balance_wei, gas_price = read_balance_and_gas_price()
+except Exception:
+    balance_wei = None
+
+if balance_wei is not None:
+    # Exakt mit Integer-Arithmetik (float verliert ab ~16 Stellen Präzision)
+    balance_eth = f"{balance_wei // WEI_PER_ETH}.{balance_wei % WEI_PER_ETH:018d}"
     
     print(f"🔍 WALLET BALANCE CHECK:")
     print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
@@ -21,14 +46,12 @@ if w3.is_connected():
     print(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     
     if balance_wei > 0:
-        gas_price = w3.eth.gas_price
         estimated_gas = 100000  # NFT mint cost
         tx_cost_wei = gas_price * estimated_gas
-        tx_cost_eth = w3.from_wei(tx_cost_wei, 'ether')
-        possible_mints = int(balance_wei / tx_cost_wei) if tx_cost_wei > 0 else 0
+        possible_mints = balance_wei // tx_cost_wei if tx_cost_wei > 0 else 0
         
-        print(f"⛽ Current Gas Price: {w3.from_wei(gas_price, 'gwei')} gwei")
-        print(f"📊 Estimated TX Cost: {tx_cost_eth} ETH")
+        print(f"⛽ Current Gas Price: {gas_price / WEI_PER_GWEI:.6f} gwei")
+        print(f"📊 Estimated TX Cost: {tx_cost_wei / WEI_PER_ETH:.12f} ETH")
         print(f"🎨 Possible NFT Mints: ~{possible_mints}")
         print(f"✅ READY TO MINT!" if balance_wei > tx_cost_wei else "⚠️ BALANCE TOO LOW")
     else:
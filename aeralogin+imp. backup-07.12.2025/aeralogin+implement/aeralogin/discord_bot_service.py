@@ -17,8 +17,11 @@ Created: 2025-12-28
 """
 
 import os
+import re
+import asyncio
 import aiohttp
 import logging
+import time
 from datetime import datetime, timezone
 from typing import Optional, Tuple, Dict, Any
 from dotenv import load_dotenv
@@ -33,6 +36,28 @@ logger.setLevel(logging.INFO)
 # Discord API Base URL
 DISCORD_API_BASE = "https://discord.com/api/v10"
 
+# Guild-Infos und Channel-Listen ändern sich selten → so lange wiederverwenden
+DISCORD_CACHE_TTL = 300  # Sekunden
+
+# Präfix für Invite-Links (discord.gg/<code>)
+_DISCORD_GG_PREFIX = "https://discord.gg/"
+
+# Invite Code, optional als voller Link (https://discord.gg/<code>)
+_INVITE_RE = re.compile(r"(?:discord\.gg/)?([A-Za-z0-9-]{2,32})/?$")
+
+
+def _as_result(value) -> Dict[str, Any]:
+    """Ergebnis aus asyncio.gather(..., return_exceptions=True) → übliches Result-Dict"""
+    if isinstance(value, BaseException):
+        return {"ok": False, "error": str(value)}
+    return value
+
+
+def _invite_code(invite: str) -> Optional[str]:
+    """Invite Code aus Code oder Link, None bei ungültigem Format"""
+    match = _INVITE_RE.search(invite.strip())
+    return match.group(1) if match else None
+
 
 class DiscordBotService:
     """
@@ -43,7 +68,19 @@ class DiscordBotService:
         self.bot_token = os.getenv("DISCORD_BOT_TOKEN", "")
         self.default_guild_id = os.getenv("DISCORD_GUILD_ID", "")  # Server ID
         self.default_channel_id = os.getenv("DISCORD_CHANNEL_ID", "")  # Channel für Invite
+        # Standard API Headers einmal bauen (die gepoolte Session übernimmt sie)
+        self._headers = {
+            "Authorization": f"Bot {self.bot_token}",
+            "Content-Type": "application/json"
+        }
         self._bot_info = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.cache_ttl = DISCORD_CACHE_TTL
+        # guild_id → (Zeitpunkt, Result-Dict)
+        self._guild_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._channels_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # guild_id → automatisch gewählter Invite-Channel (ohne DISCORD_CHANNEL_ID)
+        self._resolved_channels: Dict[str, str] = {}
     
     @property
     def is_configured(self) -> bool:
@@ -53,10 +90,30 @@ class DiscordBotService:
     @property
     def headers(self) -> Dict[str, str]:
         """Standard API Headers mit Authorization"""
-        return {
-            "Authorization": f"Bot {self.bot_token}",
-            "Content-Type": "application/json"
-        }
+        return self._headers
+    
+    def _cached(self, cache: Dict[str, Tuple[float, Dict[str, Any]]], key: str) -> Optional[Dict[str, Any]]:
+        """Gecachtes Result oder None wenn nicht vorhanden/abgelaufen"""
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.cache_ttl:
+            return entry[1]
+        return None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Gepoolte aiohttp Session (Keep-Alive zu discord.com), wird einmalig erstellt"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+            )
+        return self._session
+    
+    async def close(self):
+        """Schließt die gepoolte Session (beim Server-Shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     async def _api_request(
         self, 
@@ -78,32 +135,32 @@ class DiscordBotService:
         url = f"{DISCORD_API_BASE}{endpoint}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                kwargs = {"headers": self.headers}
-                if json_data:
-                    kwargs["json"] = json_data
+            session = await self._get_session()
+            kwargs = {}
+            if json_data:
+                kwargs["json"] = json_data
+            
+            async with session.request(method, url, **kwargs) as response:
+                # Discord gibt bei manchen Endpoints leeren Body zurück
+                if response.status == 204:
+                    return {"ok": True}
+                
+                result = await response.json()
+                
+                # Discord API Fehler haben "message" und optional "code"
+                if "message" in result and response.status >= 400:
+                    error_msg = result.get("message", "Unknown error")
+                    error_code = result.get("code", 0)
+                    logger.error("❌ Discord API Error [%s]: %s", error_code, error_msg)
+                    return {"ok": False, "error": error_msg, "code": error_code}
+                
+                return {"ok": True, "result": result}
                 
-                async with session.request(method, url, **kwargs) as response:
-                    # Discord gibt bei manchen Endpoints leeren Body zurück
-                    if response.status == 204:
-                        return {"ok": True}
-                    
-                    result = await response.json()
-                    
-                    # Discord API Fehler haben "message" und optional "code"
-                    if "message" in result and response.status >= 400:
-                        error_msg = result.get("message", "Unknown error")
-                        error_code = result.get("code", 0)
-                        logger.error(f"❌ Discord API Error [{error_code}]: {error_msg}")
-                        return {"ok": False, "error": error_msg, "code": error_code}
-                    
-                    return {"ok": True, "result": result}
-                    
         except aiohttp.ClientError as e:
-            logger.error(f"❌ Discord API Connection Error: {str(e)}")
+            logger.error("❌ Discord API Connection Error: %s", e)
             return {"ok": False, "error": f"Connection error: {str(e)}"}
         except Exception as e:
-            logger.error(f"❌ Discord API Exception: {str(e)}")
+            logger.error("❌ Discord API Exception: %s", e)
             return {"ok": False, "error": str(e)}
     
     async def get_bot_info(self) -> Dict[str, Any]:
@@ -120,7 +177,7 @@ class DiscordBotService:
         
         if result.get("ok"):
             self._bot_info = result.get("result", {})
-            logger.info(f"🤖 Bot Info: {self._bot_info.get('username')}#{self._bot_info.get('discriminator', '0')}")
+            logger.info("🤖 Bot Info: %s#%s", self._bot_info.get('username'), self._bot_info.get('discriminator', '0'))
         
         return result
     
@@ -139,18 +196,25 @@ class DiscordBotService:
         if not target_guild:
             return {"ok": False, "error": "No guild ID configured"}
         
+        cached = self._cached(self._guild_cache, target_guild)
+        if cached:
+            return cached
+        
         result = await self._api_request("GET", f"/guilds/{target_guild}")
         
         if result.get("ok"):
             guild = result.get("result", {})
-            return {
+            guild_info = {
                 "ok": True,
                 "id": guild.get("id"),
                 "name": guild.get("name"),
                 "member_count": guild.get("approximate_member_count"),
                 "icon": guild.get("icon")
             }
+            self._guild_cache[target_guild] = (time.monotonic(), guild_info)
+            return guild_info
         
+        self._guild_cache.pop(target_guild, None)
         return result
     
     async def get_guild_channels(self, guild_id: Optional[str] = None) -> Dict[str, Any]:
@@ -165,17 +229,24 @@ class DiscordBotService:
         if not target_guild:
             return {"ok": False, "error": "No guild ID configured"}
         
+        cached = self._cached(self._channels_cache, target_guild)
+        if cached:
+            return cached
+        
         result = await self._api_request("GET", f"/guilds/{target_guild}/channels")
         
         if result.get("ok"):
             channels = result.get("result", [])
             # Filtere nur Text Channels (type 0) und News Channels (type 5)
             text_channels = [ch for ch in channels if ch.get("type") in [0, 5]]
-            return {
+            channels_info = {
                 "ok": True,
                 "channels": text_channels
             }
+            self._channels_cache[target_guild] = (time.monotonic(), channels_info)
+            return channels_info
         
+        self._channels_cache.pop(target_guild, None)
         return result
     
     async def verify_bot_permissions(
@@ -199,12 +270,25 @@ class DiscordBotService:
         if not target_guild:
             return {"ok": False, "error": "No guild ID configured"}
         
-        # Get bot's member info in the guild
-        bot_info = await self.get_bot_info()
-        if not bot_info.get("ok"):
-            return bot_info
+        # Bot Info (nur falls noch nicht gecacht) und Channel-Liste (falls kein
+        # Channel angegeben) parallel holen
+        channels_result = None
+        if self._bot_info:
+            if not target_channel:
+                channels_result = await self.get_guild_channels(target_guild)
+        else:
+            if target_channel:
+                bot_info = await self.get_bot_info()
+            else:
+                bot_info, channels_result = map(_as_result, await asyncio.gather(
+                    self.get_bot_info(),
+                    self.get_guild_channels(target_guild),
+                    return_exceptions=True
+                ))
+            if not bot_info.get("ok"):
+                return bot_info
         
-        bot_id = self._bot_info.get("id")
+        bot_id = self._bot_info["id"]
         
         # Get bot's member info
         result = await self._api_request("GET", f"/guilds/{target_guild}/members/{bot_id}")
@@ -218,9 +302,8 @@ class DiscordBotService:
         # Für eine vollständige Prüfung müssten wir die Rollen-Permissions berechnen
         # Einfacher: Versuchen wir einen Test-Invite zu erstellen
         
-        # Wenn kein Channel angegeben, hole den ersten verfügbaren
+        # Wenn kein Channel angegeben, nimm den ersten verfügbaren
         if not target_channel:
-            channels_result = await self.get_guild_channels(target_guild)
             if channels_result.get("ok") and channels_result.get("channels"):
                 target_channel = channels_result["channels"][0]["id"]
             else:
@@ -265,12 +348,15 @@ class DiscordBotService:
         if not target_guild:
             return False, {"error": "DISCORD_GUILD_ID not configured"}
         
-        # Wenn kein Channel angegeben, hole den ersten verfügbaren
+        # Wenn kein Channel angegeben: zuvor gewählten wiederverwenden, sonst den ersten verfügbaren
+        if not target_channel:
+            target_channel = self._resolved_channels.get(target_guild)
         if not target_channel:
             channels_result = await self.get_guild_channels(target_guild)
             if channels_result.get("ok") and channels_result.get("channels"):
                 target_channel = channels_result["channels"][0]["id"]
-                logger.info(f"🎯 Using channel: {channels_result['channels'][0].get('name')}")
+                self._resolved_channels[target_guild] = target_channel
+                logger.info("🎯 Using channel: %s", channels_result['channels'][0].get('name'))
             else:
                 return False, {"error": "No accessible channels found in guild"}
         
@@ -283,16 +369,18 @@ class DiscordBotService:
             "temporary": False          # User bleibt permanent (nicht nur während Session)
         }
         
-        logger.info(f"🎟️ Creating one-time invite for channel {target_channel} (expires in {expire_seconds}s)")
+        logger.info("🎟️ Creating one-time invite for channel %s (expires in %ss)", target_channel, expire_seconds)
         
         result = await self._api_request("POST", f"/channels/{target_channel}/invites", invite_data)
         
         if result.get("ok"):
             invite = result.get("result", {})
             invite_code = invite.get("code", "")
-            invite_url = f"https://discord.gg/{invite_code}"
+            invite_url = _DISCORD_GG_PREFIX + invite_code
+            channel = invite.get("channel") or {}
+            guild = invite.get("guild") or {}
             
-            logger.info(f"✅ One-time link created: {invite_url}")
+            logger.info("✅ One-time link created: %s", invite_url)
             
             return True, {
                 "invite_url": invite_url,
@@ -300,14 +388,20 @@ class DiscordBotService:
                 "code": invite_code,
                 "max_uses": invite.get("max_uses"),
                 "max_age": invite.get("max_age"),
-                "channel_id": invite.get("channel", {}).get("id"),
-                "guild_id": invite.get("guild", {}).get("id"),
+                "channel_id": channel.get("id"),
+                "guild_id": guild.get("id"),
                 "is_one_time": True
             }
         else:
             error = result.get("error", "Unknown error")
             error_code = result.get("code", 0)
             
+            # Channel weg oder kein Zugriff mehr → gecachte Channel-Liste + Auswahl verwerfen
+            if error_code in (10003, 50001):
+                self._channels_cache.pop(target_guild, None)
+                if self._resolved_channels.get(target_guild) == target_channel:
+                    del self._resolved_channels[target_guild]
+            
             # Bekannte Fehler
             if error_code == 50013:
                 error = "Bot lacks CREATE_INSTANT_INVITE permission"
@@ -316,7 +410,7 @@ class DiscordBotService:
             elif error_code == 50001:
                 error = "Bot has no access to this channel"
             
-            logger.error(f"❌ Failed to create invite: {error}")
+            logger.error("❌ Failed to create invite: %s", error)
             return False, {"error": error, "code": error_code}
     
     async def revoke_invite(self, invite_code: str) -> bool:
@@ -330,8 +424,9 @@ class DiscordBotService:
             True wenn erfolgreich
         """
         # Extrahiere Code falls voller Link übergeben wurde
-        if "discord.gg/" in invite_code:
-            invite_code = invite_code.split("discord.gg/")[-1]
+        invite_code = _invite_code(invite_code)
+        if not invite_code:
+            return False
         
         result = await self._api_request("DELETE", f"/invites/{invite_code}")
         
@@ -348,8 +443,9 @@ class DiscordBotService:
             Invite Info (uses, max_uses, expires_at, etc.)
         """
         # Extrahiere Code falls voller Link
-        if "discord.gg/" in invite_code:
-            invite_code = invite_code.split("discord.gg/")[-1]
+        invite_code = _invite_code(invite_code)
+        if not invite_code:
+            return {"ok": False, "error": "Invalid invite code"}
         
         result = await self._api_request("GET", f"/invites/{invite_code}?with_counts=true")
         
@@ -433,8 +529,14 @@ async def check_discord_bot_setup() -> Dict[str, Any]:
         status["error"] = "DISCORD_GUILD_ID not set in .env"
         return status
     
+    # Bot Info + Guild Info sind unabhängig → parallel prüfen
+    bot_result, guild_result = map(_as_result, await asyncio.gather(
+        discord_bot.get_bot_info(),
+        discord_bot.get_guild_info(),
+        return_exceptions=True
+    ))
+    
     # Check bot info
-    bot_result = await discord_bot.get_bot_info()
     if bot_result.get("ok"):
         status["bot_info"] = discord_bot._bot_info
     else:
@@ -442,7 +544,6 @@ async def check_discord_bot_setup() -> Dict[str, Any]:
         return status
     
     # Check guild info
-    guild_result = await discord_bot.get_guild_info()
     if guild_result.get("ok"):
         status["guild_info"] = guild_result
     else:
@@ -466,8 +567,6 @@ async def check_discord_bot_setup() -> Dict[str, Any]:
 
 # ===== CLI TEST =====
 if __name__ == "__main__":
-    import asyncio
-    
     async def test():
         print("🎮 Testing Discord Bot Service...\n")
         
@@ -518,5 +617,7 @@ if __name__ == "__main__":
             print("   DISCORD_BOT_TOKEN=your_bot_token")
             print("   DISCORD_GUILD_ID=your_server_id")
             print("   DISCORD_CHANNEL_ID=optional_channel_id")
+        
+        await discord_bot.close()
     
     asyncio.run(test())
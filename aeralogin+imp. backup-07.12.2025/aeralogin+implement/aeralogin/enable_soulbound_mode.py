@@ -5,11 +5,15 @@ Enable Soulbound Mode for AEra Profile NFT
 This script activates soulbound mode on the Profile NFT contract,
 which blocks all transfers (except mint/burn).
 
-Usage: python3 enable_soulbound_mode.py
+Usage: python3 enable_soulbound_mode.py [--verify]
+
+--verify re-reads soulboundMode() after the transaction is confirmed
+(otherwise the successful receipt is trusted).
 """
 
 import os
 import sys
+import requests
 from web3 import Web3
 from eth_account import Account
 from dotenv import load_dotenv
@@ -22,23 +26,32 @@ RPC_URL = os.getenv("BASE_SEPOLIA_RPC_URL", "https://base-rpc.publicnode.com")
 PRIVATE_KEY = os.getenv("BACKEND_PRIVATE_KEY") or os.getenv("PRIVATE_KEY")
 PROFILE_NFT_ADDRESS = os.getenv("PROFILE_NFT_ADDRESS", "0x0a630A3Dc0C7387e0226D1b285C43B753506b27E")
 
-# Profile NFT ABI (minimal - only what we need)
-PROFILE_NFT_ABI = [
-    {
-        "inputs": [],
-        "name": "soulboundMode",
-        "outputs": [{"internalType": "bool", "name": "", "type": "bool"}],
-        "stateMutability": "view",
-        "type": "function"
-    },
-    {
-        "inputs": [{"internalType": "bool", "name": "enabled", "type": "bool"}],
-        "name": "setSoulboundMode",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function"
-    }
-]
+PROFILE_NFT = Web3.to_checksum_address(PROFILE_NFT_ADDRESS)
+
+# Static calldata, computed once: soulboundMode() and setSoulboundMode(true)
+SOULBOUND_MODE_DATA = Web3.keccak(text="soulboundMode()")[:4].hex()
+SET_SOULBOUND_MODE_DATA = Web3.keccak(text="setSoulboundMode(bool)")[:4].hex() + (1).to_bytes(32, 'big').hex()
+
+def rpc_batch(calls):
+    """
+    Send several JSON-RPC calls in ONE HTTP POST.
+    calls: [(method, params), ...] -> results in the same order
+    (a failed call yields a RuntimeError instead of its result)
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    response = requests.post(RPC_URL, json=payload, timeout=30)
+    response.raise_for_status()
+    
+    # Response order is not guaranteed -> match by id
+    by_id = {item["id"]: item for item in response.json()}
+    results = []
+    for i, (method, _) in enumerate(calls):
+        item = by_id.get(i, {"error": "missing response"})
+        results.append(RuntimeError(f"{method}: {item['error']}") if "error" in item else item["result"])
+    return results
 
 def main():
     """Enable soulbound mode on Profile NFT contract"""
@@ -48,56 +61,63 @@ def main():
         print("❌ ERROR: BACKEND_PRIVATE_KEY or PRIVATE_KEY not found in .env")
         sys.exit(1)
     
-    # Connect to blockchain
     w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    if not w3.is_connected():
-        print(f"❌ ERROR: Cannot connect to RPC: {RPC_URL}")
+    account = Account.from_key(PRIVATE_KEY)
+    
+    # Current status, gas price, nonce and chain id in one batched round trip
+    # (doubles as the connection check - chain id is read once and reused)
+    try:
+        status_result, gas_price, nonce, chain_id = rpc_batch([
+            ("eth_call", [{"to": PROFILE_NFT, "data": SOULBOUND_MODE_DATA}, "latest"]),
+            ("eth_gasPrice", []),
+            ("eth_getTransactionCount", [account.address, "latest"]),
+            ("eth_chainId", []),
+        ])
+    except Exception as e:
+        print(f"❌ ERROR: Cannot connect to RPC: {RPC_URL} ({e})")
         sys.exit(1)
     
-    account = Account.from_key(PRIVATE_KEY)
     print(f"🌐 Connected to BASE Mainnet")
     print(f"💳 Admin Wallet: {account.address}")
-    print(f"📄 Profile NFT: {PROFILE_NFT_ADDRESS}")
+    print(f"📄 Profile NFT: {PROFILE_NFT}")
     print()
     
-    # Load contract
-    profile_nft = w3.eth.contract(
-        address=Web3.to_checksum_address(PROFILE_NFT_ADDRESS),
-        abi=PROFILE_NFT_ABI
-    )
-    
     # Check current soulbound status
-    try:
-        current_status = profile_nft.functions.soulboundMode().call()
+    if isinstance(status_result, Exception):
+        print(f"⚠️  Warning: Could not read current status: {status_result}")
+    else:
+        current_status = int(status_result, 16) != 0
         print(f"📊 Current soulbound mode: {current_status}")
         
         if current_status:
             print("✅ Soulbound mode already enabled. Nothing to do.")
             return
-    except Exception as e:
-        print(f"⚠️  Warning: Could not read current status: {e}")
     
     # Enable soulbound mode
     print("\n🔒 Enabling soulbound mode...")
     print("⏳ Building transaction...")
     
     try:
-        # Get current gas price and nonce
-        gas_price = w3.eth.gas_price
-        nonce = w3.eth.get_transaction_count(account.address)
+        for result in (gas_price, nonce, chain_id):
+            if isinstance(result, Exception):
+                raise result
+        gas_price, nonce, chain_id = int(gas_price, 16), int(nonce, 16), int(chain_id, 16)
         
         print(f"⛽ Current gas price: {w3.from_wei(gas_price, 'gwei')} gwei")
         print(f"📊 Nonce: {nonce}")
         
-        # Build transaction
-        tx = profile_nft.functions.setSoulboundMode(True).build_transaction({
+        # Build transaction (all fields explicit - no implicit lookups by web3)
+        tx = {
             'from': account.address,
+            'to': PROFILE_NFT,
+            'data': SET_SOULBOUND_MODE_DATA,
+            'value': 0,
             'nonce': nonce,
             'gas': 100000,
             'maxFeePerGas': int(gas_price * 1.5),
             'maxPriorityFeePerGas': w3.to_wei(0.001, 'gwei'),
-            'chainId': w3.eth.chain_id
-        })
+            'chainId': chain_id
+        }
         
         # Sign transaction
         print("✍️  Signing transaction...")
@@ -117,9 +137,10 @@ def main():
             print(f"🔗 Block: {receipt['blockNumber']}")
             print(f"⛽ Gas used: {receipt['gasUsed']:,}")
             
-            # Verify new status
-            new_status = profile_nft.functions.soulboundMode().call()
-            print(f"📊 Verified soulbound mode: {new_status}")
+            # Receipt status 1 = setSoulboundMode(True) succeeded; re-read only on request
+            if "--verify" in sys.argv:
+                new_status = int.from_bytes(w3.eth.call({'to': PROFILE_NFT, 'data': SOULBOUND_MODE_DATA}), 'big') != 0
+                print(f"📊 Verified soulbound mode: {new_status}")
             
             print("\n🎉 Profile NFTs are now SOULBOUND - transfers are blocked!")
         else:
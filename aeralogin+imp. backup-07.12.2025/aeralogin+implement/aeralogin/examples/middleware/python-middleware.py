@@ -26,6 +26,8 @@ FastAPI Usage:
         client_secret='your-client-secret'
     )
     
+    app.add_event_handler('shutdown', aera.aclose)
+    
     @app.get('/protected')
     async def protected_page(aera_user: dict = Depends(aera.fastapi_dependency)):
         return {"wallet": aera_user["wallet"]}
@@ -45,26 +47,55 @@ Django Usage:
         def __call__(self, request):
             request.aera_user = self.aera.verify_request(request)
             return self.get_response(request)
+
+Requires httpx (pip install httpx). Call aera.close() / await aera.aclose()
+on app shutdown to release pooled connections.
 """
 
+import asyncio
 import os
 import hmac
-import hashlib
+import json
 import secrets
-import time
+import threading
+import weakref
+from collections import OrderedDict
 from functools import wraps
+from time import monotonic
 from typing import Optional, Dict, Any, Callable
-from urllib.parse import urlencode
+from urllib.parse import quote_plus, urlencode
+
+import httpx
 
 try:
-    import requests
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
 except ImportError:
-    requests = None
+    HTTP2_AVAILABLE = False
 
 try:
-    import httpx
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    httpx = None
+    ORJSON_AVAILABLE = False
+
+# Shared connection pool settings for the sync and async clients
+HTTP_TIMEOUT = 10.0
+HTTP_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20)
+HTTP_RETRIES = 2  # connect retries only (never re-sends a request that reached the server)
+HTTP_HEADERS = {
+    'User-Agent': 'aera-gate-python',
+    'Accept': 'application/json',
+    'Content-Type': 'application/json'
+}
+
+# Failed verifications are cached briefly so a replayed bad token or an upstream
+# outage does not hit /api/v1/verify on every request
+ERROR_CACHE_TTL = 5.0  # seconds, for 5xx / 429 / connection errors
+_MISS = object()  # cache miss marker (cached None = known invalid token)
+
+NFT_REQUIRED_ERROR = 'AEra Identity NFT required'
+REQUIREMENTS_OK = (True, '')
 
 
 class AEraGate:
@@ -81,7 +112,9 @@ class AEraGate:
         callback_path: str = '/auth/aera/callback',
         require_nft: bool = True,
         min_score: int = 0,
-        cache_ttl: int = 300  # 5 minutes
+        cache_ttl: int = 300,  # 5 minutes
+        cache_max_size: int = 4096,
+        neg_cache_ttl: float = 30.0
     ):
         """
         Initialize AEra Gate.
@@ -95,6 +128,8 @@ class AEraGate:
             require_nft: Require AEra Identity NFT
             min_score: Minimum required resonance score
             cache_ttl: Token verification cache TTL in seconds
+            cache_max_size: Max cached verifications (least recently used are evicted)
+            neg_cache_ttl: Cache TTL in seconds for tokens rejected as invalid
         """
         self.client_id = client_id
         self.client_secret = client_secret
@@ -104,43 +139,153 @@ class AEraGate:
         self.require_nft = require_nft
         self.min_score = min_score
         self.cache_ttl = cache_ttl
+        self.cache_max_size = cache_max_size
+        self.neg_cache_ttl = neg_cache_ttl
         
-        # Token verification cache
-        self._cache: Dict[str, Dict[str, Any]] = {}
-    
-    def _http_client(self):
-        """Get HTTP client (prefers httpx for async support)."""
-        if httpx:
-            return httpx.Client(timeout=10)
-        elif requests:
-            return requests
-        else:
-            raise RuntimeError("No HTTP client available. Install 'requests' or 'httpx'.")
+        # Authorize URL up to the per-login parameters (same encoding as urlencode)
+        self._login_url_prefix = f'{self.base_url}/oauth/authorize?' + urlencode({'client_id': client_id})
+        
+        # /oauth/token body with the per-instance fields pre-encoded; only code and
+        # redirect_uri are serialized per exchange (see _token_body)
+        self._token_body_prefix = (
+            '{"grant_type":"authorization_code"'
+            f',"client_id":{json.dumps(client_id)}'
+            f',"client_secret":{json.dumps(client_secret)}'
+            ',"code":'
+        )
+        
+        # Token verification cache: token -> (expiry monotonic, user data), LRU order
+        self._cache: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()  # short critical sections, safe from async code too
+        # In-flight verifications per cache key (sync and async paths)
+        self._sync_locks: Dict[str, threading.Lock] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Pooled clients reused across requests (keep-alive, one TLS handshake per connection)
+        self._client = httpx.Client(
+            base_url=self.base_url,
+            headers=HTTP_HEADERS,
+            timeout=HTTP_TIMEOUT,
+            transport=httpx.HTTPTransport(retries=HTTP_RETRIES, limits=HTTP_LIMITS)
+        )
+        # Async clients are bound to one event loop: one per loop, created on first use
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._async_clients_lock = threading.Lock()
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Pooled async client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                # Drop clients of closed loops (their connections died with the loop)
+                for old_loop in [old for old in self._async_clients if old.is_closed()]:
+                    del self._async_clients[old_loop]
+                client = httpx.AsyncClient(
+                    base_url=self.base_url,
+                    headers=HTTP_HEADERS,
+                    timeout=HTTP_TIMEOUT,
+                    transport=httpx.AsyncHTTPTransport(
+                        http2=HTTP2_AVAILABLE, retries=HTTP_RETRIES, limits=HTTP_LIMITS
+                    )
+                )
+                self._async_clients[loop] = client
+        return client
+    
+    def close(self):
+        """Close the pooled sync HTTP client (call on app shutdown)."""
+        self._client.close()
+    
+    async def aclose(self):
+        """Close the sync client and the async clients of all event loops (call on async app shutdown)."""
+        self._client.close()
+        with self._async_clients_lock:
+            clients = list(self._async_clients.items())
+            self._async_clients.clear()
+        
+        loop = asyncio.get_running_loop()
+        for client_loop, client in clients:
+            if client_loop is loop:
+                await client.aclose()
+            elif client_loop.is_running():
+                # Close on the loop the client belongs to
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), client_loop))
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    @staticmethod
+    def _nonce(nbytes: int = 32) -> str:
+        """URL-safe random value for OAuth state (one urandom read per call)."""
+        return secrets.token_urlsafe(nbytes)
+    
+    def _cache_get(self, cache_key: str):
+        """Cached user data (None for a known invalid token), or _MISS."""
+        with self._cache_lock:
+            entry = self._cache.get(cache_key)
+            if entry is None:
+                return _MISS
+            if entry[0] <= monotonic():
+                del self._cache[cache_key]
+                return _MISS
+            self._cache.move_to_end(cache_key)
+            return entry[1]
+    
+    def _cache_put(self, cache_key: str, user_data: Optional[Dict[str, Any]], ttl: Optional[float] = None):
+        """Store a verification result, evicting the least recently used entry when full."""
+        expires = monotonic() + (self.cache_ttl if ttl is None else ttl)
+        with self._cache_lock:
+            self._cache[cache_key] = (expires, user_data)
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.cache_max_size:
+                self._cache.popitem(last=False)
+    
+    def _error_ttl(self, exc: Exception) -> Optional[float]:
+        """How long to cache a failed verification (None = not at all)."""
+        if isinstance(exc, httpx.HTTPStatusError):
+            if exc.response.status_code in (401, 403):
+                return self.neg_cache_ttl
+            return ERROR_CACHE_TTL
+        if isinstance(exc, httpx.TransportError):
+            return ERROR_CACHE_TTL
+        return None
+    
+    def _token_body(self, code: str, redirect_uri: str) -> bytes:
+        """JSON body for the authorization code exchange."""
+        return (
+            f'{self._token_body_prefix}{json.dumps(code)}'
+            f',"redirect_uri":{json.dumps(redirect_uri)}}}'
+        ).encode('utf-8')
+    
+    @staticmethod
+    def _decode_json(response: "httpx.Response") -> Dict[str, Any]:
+        """Parse a JSON response body (orjson straight from bytes when installed)."""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
     
     def _make_request(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """Make HTTP request and return JSON response."""
-        if httpx:
-            with httpx.Client(timeout=10) as client:
-                response = getattr(client, method)(url, **kwargs)
-                response.raise_for_status()
-                return response.json()
-        elif requests:
-            response = getattr(requests, method)(url, timeout=10, **kwargs)
-            response.raise_for_status()
-            return response.json()
-        else:
-            raise RuntimeError("No HTTP client available.")
+        response = self._client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return self._decode_json(response)
     
     async def _make_request_async(self, method: str, url: str, **kwargs) -> Dict[str, Any]:
         """Make async HTTP request and return JSON response."""
-        if httpx:
-            async with httpx.AsyncClient(timeout=10) as client:
-                response = await getattr(client, method)(url, **kwargs)
-                response.raise_for_status()
-                return response.json()
-        else:
-            # Fallback to sync
-            return self._make_request(method, url, **kwargs)
+        response = await self._get_async_client().request(method, url, **kwargs)
+        response.raise_for_status()
+        return self._decode_json(response)
     
     def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
@@ -152,83 +297,116 @@ class AEraGate:
         Returns:
             User data dict if valid, None otherwise
         """
-        # Check cache
-        cache_key = hashlib.sha256(token.encode()).hexdigest()[:16]
-        cached = self._cache.get(cache_key)
-        if cached and cached['expires'] > time.time():
-            return cached['data']
+        # Check cache (keyed by the token itself; the cached user data holds it anyway)
+        cache_key = token
+        cached = self._cache_get(cache_key)
+        if cached is not _MISS:
+            return cached
         
+        # Single-flight: concurrent requests with the same token share one API call
+        lock = self._sync_locks.setdefault(cache_key, threading.Lock())
+        try:
+            with lock:
+                cached = self._cache_get(cache_key)
+                if cached is not _MISS:
+                    return cached
+                return self._fetch_user(token, cache_key)
+        finally:
+            if self._sync_locks.get(cache_key) is lock:
+                self._sync_locks.pop(cache_key, None)
+    
+    def _fetch_user(self, token: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Call the verify endpoint and cache the result."""
         try:
             data = self._make_request(
-                'post',
-                f'{self.base_url}/api/v1/verify',
-                headers={
-                    'Authorization': f'Bearer {token}',
-                    'Content-Type': 'application/json'
-                }
+                'POST',
+                '/api/v1/verify',
+                headers={'Authorization': f'Bearer {token}'}
             )
-            
-            if not data.get('valid'):
-                return None
-            
-            user_data = {
-                'wallet': data.get('wallet'),
-                'score': data.get('score', 0),
-                'has_nft': data.get('has_nft', False),
-                'token': token
-            }
-            
-            # Cache result
-            self._cache[cache_key] = {
-                'data': user_data,
-                'expires': time.time() + self.cache_ttl
-            }
-            
-            return user_data
-            
+            return self._store_verification(token, cache_key, data)
         except Exception as e:
-            print(f"AEra verification error: {e}")
+            return self._store_verification_error(cache_key, e)
+    
+    def _store_verification(self, token: str, cache_key: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build and cache user data from a verify response (None if invalid)."""
+        if not data.get('valid'):
+            self._cache_put(cache_key, None, self.neg_cache_ttl)
             return None
+        
+        user_data = {
+            'wallet': data.get('wallet'),
+            'score': data.get('score', 0),
+            'has_nft': data.get('has_nft', False),
+            'token': token
+        }
+        
+        # Cache result
+        self._cache_put(cache_key, user_data)
+        
+        return user_data
+    
+    def _store_verification_error(self, cache_key: str, exc: Exception) -> None:
+        """Log a failed verify call and cache it briefly where that is safe."""
+        print(f"AEra verification error: {exc}")
+        ttl = self._error_ttl(exc)
+        if ttl:
+            self._cache_put(cache_key, None, ttl)
+        return None
     
     async def verify_token_async(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Async version of verify_token.
         """
-        cache_key = hashlib.sha256(token.encode()).hexdigest()[:16]
-        cached = self._cache.get(cache_key)
-        if cached and cached['expires'] > time.time():
-            return cached['data']
+        cache_key = token
+        cached = self._cache_get(cache_key)
+        if cached is not _MISS:
+            return cached
+        
+        # Single-flight: followers await the leader's future and share its result
+        future = self._inflight.get(cache_key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled
+                return await self.verify_token_async(token)  # leader was cancelled, retry
         
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            user_data = await self._fetch_user_async(token, cache_key)
+            future.set_result(user_data)
+            return user_data
+        finally:
+            if not future.done():
+                future.cancel()
+            if self._inflight.get(cache_key) is future:
+                del self._inflight[cache_key]
+    
+    async def _fetch_user_async(self, token: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Async version of _fetch_user."""
         try:
             data = await self._make_request_async(
-                'post',
-                f'{self.base_url}/api/v1/verify',
-                headers={
-                    'Authorization': f'Bearer {token}',
-                    'Content-Type': 'application/json'
-                }
+                'POST',
+                '/api/v1/verify',
+                headers={'Authorization': f'Bearer {token}'}
             )
-            
-            if not data.get('valid'):
-                return None
-            
-            user_data = {
-                'wallet': data.get('wallet'),
-                'score': data.get('score', 0),
-                'has_nft': data.get('has_nft', False),
-                'token': token
-            }
-            
-            self._cache[cache_key] = {
-                'data': user_data,
-                'expires': time.time() + self.cache_ttl
-            }
-            
-            return user_data
-            
+            return self._store_verification(token, cache_key, data)
         except Exception as e:
-            print(f"AEra verification error: {e}")
-            return None
+            return self._store_verification_error(cache_key, e)
+    
+    async def verify_tokens_async(self, tokens: list[str]) -> list[Optional[Dict[str, Any]]]:
+        """
+        Verify several access tokens concurrently.
+        
+        Args:
+            tokens: Access tokens to verify
+            
+        Returns:
+            User data dict (or None) per token, in input order
+        """
+        return await asyncio.gather(*(self.verify_token_async(token) for token in tokens))
     
     def check_requirements(self, user: Dict[str, Any]) -> tuple[bool, str]:
         """
@@ -241,12 +419,15 @@ class AEraGate:
             Tuple of (passes, error_message)
         """
         if self.require_nft and not user.get('has_nft'):
-            return False, 'AEra Identity NFT required'
+            return False, NFT_REQUIRED_ERROR
         
-        if self.min_score > 0 and user.get('score', 0) < self.min_score:
-            return False, f'Minimum score of {self.min_score} required (you have {user.get("score", 0)})'
+        min_score = self.min_score
+        if min_score > 0:
+            score = user.get('score', 0)
+            if score < min_score:
+                return False, f'Minimum score of {min_score} required (you have {score})'
         
-        return True, ''
+        return REQUIREMENTS_OK
     
     def get_login_url(self, redirect_uri: str, state: Optional[str] = None) -> str:
         """
@@ -260,16 +441,12 @@ class AEraGate:
             Login URL string
         """
         if state is None:
-            state = secrets.token_urlsafe(32)
+            state = self._nonce()
         
-        params = urlencode({
-            'client_id': self.client_id,
-            'redirect_uri': redirect_uri,
-            'response_type': 'code',
-            'state': state
-        })
-        
-        return f'{self.base_url}/oauth/authorize?{params}'
+        return (
+            f'{self._login_url_prefix}&redirect_uri={quote_plus(redirect_uri)}'
+            f'&response_type=code&state={quote_plus(state)}'
+        )
     
     def exchange_code(self, code: str, redirect_uri: str) -> Dict[str, Any]:
         """
@@ -283,15 +460,9 @@ class AEraGate:
             Token response dict
         """
         return self._make_request(
-            'post',
-            f'{self.base_url}/oauth/token',
-            json={
-                'grant_type': 'authorization_code',
-                'code': code,
-                'redirect_uri': redirect_uri,
-                'client_id': self.client_id,
-                'client_secret': self.client_secret
-            }
+            'POST',
+            '/oauth/token',
+            content=self._token_body(code, redirect_uri)
         )
     
     async def exchange_code_async(self, code: str, redirect_uri: str) -> Dict[str, Any]:
@@ -299,15 +470,9 @@ class AEraGate:
         Async version of exchange_code.
         """
         return await self._make_request_async(
-            'post',
-            f'{self.base_url}/oauth/token',
-            json={
-                'grant_type': 'authorization_code',
-                'code': code,
-                'redirect_uri': redirect_uri,
-                'client_id': self.client_id,
-                'client_secret': self.client_secret
-            }
+            'POST',
+            '/oauth/token',
+            content=self._token_body(code, redirect_uri)
         )
     
     def verify_nft(self, access_token: str) -> Dict[str, Any]:
@@ -321,8 +486,8 @@ class AEraGate:
             Verification result dict
         """
         return self._make_request(
-            'post',
-            f'{self.base_url}/api/oauth/verify-nft',
+            'POST',
+            '/api/oauth/verify-nft',
             json={
                 'access_token': access_token,
                 'client_id': self.client_id,
@@ -345,7 +510,7 @@ class AEraGate:
         
         @app.route('/auth/aera/login')
         def aera_login():
-            state = secrets.token_urlsafe(32)
+            state = self._nonce()
             session['aera_state'] = state
             session['aera_return_to'] = request.args.get('next', '/')
             
@@ -471,7 +636,7 @@ def aera_required(aera: AEraGate, min_score: int = 0, require_nft: bool = True):
             
             # Check requirements
             if require_nft and not user.get('has_nft'):
-                return jsonify({'error': 'AEra Identity NFT required'}), 403
+                return jsonify({'error': NFT_REQUIRED_ERROR}), 403
             
             if min_score > 0 and user.get('score', 0) < min_score:
                 return jsonify({
@@ -561,7 +726,7 @@ def aera_login_required(view_func=None, min_score=0, require_nft=True):
             user = request.aera_user
             
             if require_nft and not user.get('has_nft'):
-                return JsonResponse({'error': 'AEra Identity NFT required'}, status=403)
+                return JsonResponse({'error': NFT_REQUIRED_ERROR}, status=403)
             
             if min_score > 0 and user.get('score', 0) < min_score:
                 return JsonResponse({
@@ -0,0 +1,211 @@
+"""
+VEra-Resonance — Contract Log Cache
+© 2025 Karlheinz Beismann — VEra-Resonance Project
+Licensed under the Apache License, Version 2.0
+
+Lokaler SQLite-Index für eth_getLogs Ergebnisse (analyze_contracts*.py).
+Pro Contract wird der bereits gescannte Blockbereich gespeichert, spätere
+Läufe laden nur noch die fehlenden Blöcke vom RPC nach. Im Live-Modus
+(--follow) kommen neue Events per WebSocket einzeln dazu. Block-Timestamps
+ändern sich nie und werden ebenfalls gecacht.
+"""
+
+import os
+import sqlite3
+from typing import List, Tuple
+
+from hexbytes import HexBytes
+
+LOG_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs_cache.db")
+
+
+def get_log_cache_connection(path: str = LOG_CACHE_PATH) -> sqlite3.Connection:
+    """Öffnet den Cache und legt die Tabellen bei Bedarf an"""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS logs (
+            contract TEXT NOT NULL,
+            block INTEGER NOT NULL,
+            log_index INTEGER NOT NULL,
+            tx BLOB NOT NULL,
+            topic0 BLOB,
+            topic1 BLOB,
+            topic2 BLOB,
+            topic3 BLOB,
+            data BLOB,
+            PRIMARY KEY (contract, block, log_index)
+        )
+    """)
+    # Gescannter Bereich pro Contract (auch Blöcke ohne Events)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS scanned_ranges (
+            contract TEXT PRIMARY KEY,
+            from_block INTEGER NOT NULL,
+            to_block INTEGER NOT NULL
+        )
+    """)
+    # Block → Timestamp (für Erste/Letzte Aktivität)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS block_timestamps (
+            block INTEGER PRIMARY KEY,
+            timestamp INTEGER NOT NULL
+        )
+    """)
+    return conn
+
+
+def _scanned_range(conn: sqlite3.Connection, contract: str):
+    """(from_block, to_block) des gescannten Bereichs oder None"""
+    return conn.execute(
+        "SELECT from_block, to_block FROM scanned_ranges WHERE contract = ?",
+        (contract.lower(),)
+    ).fetchone()
+
+
+def _is_disjoint(cached: tuple, from_block: int, to_block: int) -> bool:
+    """Bereiche berühren sich nicht → der gescannte Bereich wird ersetzt"""
+    cached_from, cached_to = cached
+    return from_block > cached_to + 1 or to_block < cached_from - 1
+
+
+def missing_ranges(conn: sqlite3.Connection, contract: str,
+                   from_block: int, to_block: int) -> List[Tuple[int, int]]:
+    """Blockbereiche (inklusive), die noch vom RPC geladen werden müssen"""
+    cached = _scanned_range(conn, contract)
+    if cached is None or _is_disjoint(cached, from_block, to_block):
+        return [(from_block, to_block)]
+
+    cached_from, cached_to = cached
+    ranges = []
+    if from_block < cached_from:
+        ranges.append((from_block, cached_from - 1))
+    if to_block > cached_to:
+        ranges.append((cached_to + 1, to_block))
+    return ranges
+
+
+def _log_rows(contract: str, logs: list):
+    """Logs → Zeilen der logs-Tabelle"""
+    for log in logs:
+        topics = [bytes(topic) for topic in log['topics']] + [None] * (4 - len(log['topics']))
+        yield (
+            contract,
+            log['blockNumber'],
+            log['logIndex'],
+            bytes(log['transactionHash']),
+            *topics[:4],
+            bytes(HexBytes(log['data'])),
+        )
+
+
+def _insert_logs(conn: sqlite3.Connection, contract: str, logs: list):
+    conn.executemany(
+        "INSERT OR IGNORE INTO logs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        _log_rows(contract, logs)
+    )
+
+
+def _mark_scanned(conn: sqlite3.Connection, contract: str, from_block: int, to_block: int):
+    cached = _scanned_range(conn, contract)
+    if cached is not None and not _is_disjoint(cached, from_block, to_block):
+        from_block = min(from_block, cached[0])
+        to_block = max(to_block, cached[1])
+    conn.execute(
+        "INSERT OR REPLACE INTO scanned_ranges (contract, from_block, to_block) VALUES (?, ?, ?)",
+        (contract, from_block, to_block)
+    )
+
+
+def insert_logs(conn: sqlite3.Connection, contract: str, logs: list):
+    """
+    Speichert Logs, ohne den gescannten Bereich zu ändern (Zwischenstand
+    während des Ladens). Danach mark_scanned() aufrufen, sobald ALLE
+    fehlenden Bereiche erfolgreich geladen wurden.
+    """
+    with conn:
+        _insert_logs(conn, contract.lower(), logs)
+
+
+def mark_scanned(conn: sqlite3.Connection, contract: str, from_block: int, to_block: int):
+    """Erweitert den gescannten Bereich eines Contracts"""
+    with conn:
+        _mark_scanned(conn, contract.lower(), from_block, to_block)
+
+
+def store_logs(conn: sqlite3.Connection, contract: str, logs: list,
+               from_block: int, to_block: int):
+    """
+    Speichert nachgeladene Logs und erweitert den gescannten Bereich.
+    Nur aufrufen, wenn ALLE fehlenden Bereiche erfolgreich geladen wurden.
+    """
+    contract = contract.lower()
+    with conn:
+        _insert_logs(conn, contract, logs)
+        _mark_scanned(conn, contract, from_block, to_block)
+
+
+def load_logs(conn: sqlite3.Connection, contract: str,
+              from_block: int, to_block: int) -> List[dict]:
+    """
+    Logs eines Contracts aus dem Cache, sortiert wie eth_getLogs.
+    Liefert Dicts mit denselben Keys wie web3 (blockNumber, logIndex,
+    transactionHash, topics, data).
+    """
+    cursor = conn.execute("""
+        SELECT block, log_index, tx, topic0, topic1, topic2, topic3, data
+        FROM logs
+        WHERE contract = ? AND block BETWEEN ? AND ?
+        ORDER BY block, log_index
+    """, (contract.lower(), from_block, to_block))
+
+    return [
+        {
+            'blockNumber': block,
+            'logIndex': log_index,
+            'transactionHash': HexBytes(tx),
+            'topics': [HexBytes(topic) for topic in (topic0, topic1, topic2, topic3) if topic is not None],
+            'data': HexBytes(data),
+        }
+        for block, log_index, tx, topic0, topic1, topic2, topic3, data in cursor
+    ]
+
+
+def remove_log(conn: sqlite3.Connection, contract: str, block: int, log_index: int):
+    """Entfernt ein Log, das durch eine Reorg ungültig wurde (removed=true)"""
+    with conn:
+        conn.execute(
+            "DELETE FROM logs WHERE contract = ? AND block = ? AND log_index = ?",
+            (contract.lower(), block, log_index)
+        )
+
+
+def delete_logs(conn: sqlite3.Connection, contract: str, from_block: int, to_block: int):
+    """Entfernt alle Logs eines Blockbereichs (vor dem erneuten Laden)"""
+    with conn:
+        conn.execute(
+            "DELETE FROM logs WHERE contract = ? AND block BETWEEN ? AND ?",
+            (contract.lower(), from_block, to_block)
+        )
+
+
+def load_block_timestamps(conn: sqlite3.Connection, blocks: list) -> dict:
+    """{block: timestamp} für die bereits gecachten Blöcke"""
+    blocks = list(set(blocks))
+    if not blocks:
+        return {}
+    placeholders = ",".join("?" * len(blocks))
+    return dict(conn.execute(
+        f"SELECT block, timestamp FROM block_timestamps WHERE block IN ({placeholders})",
+        blocks
+    ).fetchall())
+
+
+def store_block_timestamps(conn: sqlite3.Connection, timestamps: dict):
+    """Neu geladene Block-Timestamps speichern"""
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO block_timestamps (block, timestamp) VALUES (?, ?)",
+            timestamps.items()
+        )
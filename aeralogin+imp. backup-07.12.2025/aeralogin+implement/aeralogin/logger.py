@@ -104,27 +104,36 @@ api_logger = setup_logger("AEra.API")          # API Requests
 wallet_logger = setup_logger("AEra.Wallet")    # Wallet Operationen
 airdrop_logger = setup_logger("AEra.Airdrop")  # Airdrop Worker
 
-def log_activity(level, category, message, **extra_data):
+_ACTIVITY_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+def log_activity(level, category, message, *args, **extra_data):
     """
     Protokolliere eine Aktivität mit Kategorie
     
+    Nachricht und Extra-Felder werden erst formatiert, wenn der Level aktiv ist.
+    
     Beispiel:
         log_activity("INFO", "AUTH", "User registered", address="0x...", score=50)
+        log_activity("INFO", "OAUTH", "Message hash: %s", message_hash.hex())
     """
+    levelno = _ACTIVITY_LEVELS.get(level.upper())
+    if levelno is None or not logger.isEnabledFor(levelno):
+        return
+    
+    if args:
+        message = message % args
+    
     full_message = f"[{category}] {message}"
     if extra_data:
         full_message += " | " + " | ".join(f"{k}={v}" for k, v in extra_data.items())
     
-    if level.upper() == "DEBUG":
-        logger.debug(full_message)
-    elif level.upper() == "INFO":
-        logger.info(full_message)
-    elif level.upper() == "WARNING":
-        logger.warning(full_message)
-    elif level.upper() == "ERROR":
-        logger.error(full_message)
-    elif level.upper() == "CRITICAL":
-        logger.critical(full_message)
+    logger.log(levelno, full_message)
 
 if __name__ == "__main__":
     # Test Logging
@@ -600,7 +600,14 @@ def init_db():
         FOREIGN KEY(follower_address) REFERENCES users(address)
     )
     """)
-    
+
+    # Partial index for the airdrop worker's pending-reward query
+    # (only unrewarded verified follows are indexed, ordered by verified_at)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_followers_pending
+    ON followers(verified_at) WHERE follow_confirmed = 0 AND verified = 1
+    """)
+
     # Telegram-Invites-Tabelle: Track Telegram/Discord Gate Access (with owner tracking)
     # MULTI-GATE SUPPORT: UNIQUE constraint includes group_id to allow same user in different groups
     cursor.execute("""
@@ -723,6 +730,13 @@ def init_db():
     )
     """)
     
+    # Partial covering index for the /oauth/complete pending lookup
+    # (only open codes are indexed, used/expired rows never touch it)
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_oauth_codes_lookup
+    ON oauth_codes(nonce, used, expires_at) WHERE used = 0
+    """)
+    
     # OAuth Sessions: JWT sessions for third-party sites
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS oauth_sessions (
@@ -940,6 +954,10 @@ async def startup_event():
     asyncio.create_task(oauth_session_cleanup_loop())
     logger.info("   🧹 OAuth Session Cleanup Job gestartet")
     
+    # Starte OAuth Code Pruner (abgelaufene/verbrauchte Authorization Codes)
+    asyncio.create_task(oauth_code_prune_loop())
+    logger.info("   🧹 OAuth Code Pruner gestartet")
+    
     # Initial Scan: Füge alle User mit Score ≥10 zur Sync-Queue hinzu (async task)
     async def initial_sync_scan():
         try:
@@ -983,6 +1001,12 @@ async def startup_event():
     # Start initial scan as async task
     asyncio.create_task(initial_sync_scan())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """App-Stop: Gepoolte HTTP Sessions schließen"""
+    if DISCORD_BOT_AVAILABLE and discord_bot:
+        await discord_bot.close()
+
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """AEraLogin Landing Page - Now serving landing.html"""
@@ -7961,6 +7985,37 @@ async def oauth_session_cleanup_loop():
         await asyncio.sleep(3600)
 
 
+async def oauth_code_prune_loop():
+    """
+    Background task that deletes expired or used OAuth authorization codes.
+    
+    Codes are single-use and live only OAUTH_CODE_EXPIRY_SECONDS, so unlike
+    sessions they carry no audit value. Keeps oauth_codes (and the
+    /oauth/complete lookup) small. Runs every 5 minutes.
+    """
+    await asyncio.sleep(60)  # 1 minute initial delay
+    
+    while True:
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM oauth_codes WHERE expires_at < ? OR used = 1",
+                (datetime.now(timezone.utc).isoformat(),)
+            )
+            pruned = cursor.rowcount
+            conn.commit()
+            conn.close()
+            
+            if pruned > 0:
+                logger.info(f"🧹 OAuth Code Pruner: {pruned} expired/used codes deleted")
+            
+        except Exception as e:
+            logger.error(f"❌ OAuth Code Pruner error: {str(e)}")
+        
+        await asyncio.sleep(300)
+
+
 @app.get("/api/airdrop-status/{address}")
 async def get_airdrop_status(address: str):
     """
@@ -9436,10 +9491,10 @@ async def get_sync_queue():
         "queue_size": len(sync_queue),
         "items": [
             {
-                "address": item["address"][:10] + "...",
-                "score": item["score"],
-                "attempts": item["attempts"],
-                "last_attempt": item["last_attempt"].isoformat() if item.get("last_attempt") else None
+                "address": item.address[:10] + "...",
+                "score": item.score,
+                "retries": item.retries,
+                "queued_at": datetime.fromtimestamp(item.timestamp).isoformat()
             }
             for item in sync_queue
         ]
@@ -21,6 +21,9 @@ from logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# ERC-721 Transfer(address indexed from, address indexed to, uint256 indexed tokenId)
+TRANSFER_EVENT_TOPIC = bytes(Web3.keccak(text='Transfer(address,address,uint256)'))
+
 
 class Web3Service:
     """Service for interacting with BASE Mainnet blockchain"""
@@ -358,8 +361,8 @@ class Web3Service:
         """
         import time
         
-        # Get current nonce from blockchain
-        current_nonce = self.w3.eth.get_transaction_count(self.account.address, 'latest')
+        # Get current nonce from blockchain (sync web3 call → worker thread, event loop stays free)
+        current_nonce = await asyncio.to_thread(self.w3.eth.get_transaction_count, self.account.address, 'latest')
         
         # If we have a cached nonce and it's recent (< 30 seconds), use cached + 1
         if self._last_nonce is not None and (time.time() - self._last_nonce_time) < 30:
@@ -450,14 +453,11 @@ class Web3Service:
                 logger.warning(f"TX {tx_hash[:10]}... failed or not found for {address}")
                 return None
             
-            # Parse Transfer event from logs
-            # Transfer(address indexed from, address indexed to, uint256 indexed tokenId)
-            transfer_topic = self.w3.keccak(text='Transfer(address,address,uint256)').hex()
-            
+            # Parse Transfer event from logs (compare raw topic bytes, no hex round-trip)
             for log in receipt['logs']:
-                if log['topics'][0].hex() == transfer_topic:
+                if log['topics'] and log['topics'][0] == TRANSFER_EVENT_TOPIC:
                     # Token ID is in topics[3]
-                    token_id = int(log['topics'][3].hex(), 16)
+                    token_id = int.from_bytes(log['topics'][3], 'big')
                     logger.info(f"✅ Found token ID {token_id} from TX receipt for {address}")
                     return token_id
             
@@ -543,7 +543,7 @@ class Web3Service:
                 return 0
             
             checksum_address = Web3.to_checksum_address(address)
-            score = self.resonance_score.functions.getResonance(checksum_address).call()
+            score = await asyncio.to_thread(self.resonance_score.functions.getResonance(checksum_address).call)
             return int(score)
             
         except Exception as e:
@@ -561,6 +561,7 @@ class Web3Service:
             # Build transaction with proper nonce management (LOCK!)
             async with self._nonce_lock:
                 nonce = await self._get_next_nonce()
+                gas_price = await asyncio.to_thread(lambda: self.w3.eth.gas_price)
                 
                 update_tx = self.resonance_score.functions.adminAdjust(
                     checksum_address, 
@@ -569,8 +570,8 @@ class Web3Service:
                     'from': self.account.address,
                     'nonce': nonce,
                     'gas': 100000,
-                    'maxFeePerGas': self.w3.eth.gas_price * 2,
-                    'maxPriorityFeePerGas': self.w3.eth.gas_price,
+                    'maxFeePerGas': gas_price * 2,
+                    'maxPriorityFeePerGas': gas_price,
                     'chainId': 8453
                 })
                 
@@ -580,7 +581,7 @@ class Web3Service:
                 if raw_tx is None:
                     raise ValueError("Could not get raw transaction from signed transaction")
                 
-                tx_hash = self.w3.eth.send_raw_transaction(raw_tx)
+                tx_hash = await asyncio.to_thread(self.w3.eth.send_raw_transaction, raw_tx)
                 tx_hash_hex = tx_hash.hex()
                 
                 logger.info(f"� Score update transaction sent: {tx_hash_hex}")
@@ -590,7 +591,8 @@ class Web3Service:
             
             # Wait for confirmation
             logger.info(f"⏳ Waiting for score update confirmation...")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            # Up to 120s of polling - must not block the server's event loop
+            receipt = await asyncio.to_thread(self.w3.eth.wait_for_transaction_receipt, tx_hash, timeout=120)
             
             if receipt['status'] == 1:
                 logger.info(f"✅ Score updated successfully! Block: {receipt['blockNumber']}")
@@ -0,0 +1,231 @@
+"""
+🧠 AEra Semantic Cache
+======================
+
+Flüchtiger In-Memory Cache für umformulierte Fragen.
+Nachrichten werden mit einem kleinen lokalen Modell eingebettet und per
+Cosine-Similarity gegen bereits beantwortete Fragen verglichen.
+
+Features:
+- Mehrsprachiges Embedding-Modell (Deutsch + Englisch)
+- Bevorzugt int8-quantisiertes ONNX-Modell (onnxruntime), sonst PyTorch
+- faiss HNSW Index (normalisierte Vektoren → Inner Product = Cosine)
+- Begrenzte Größe mit FIFO-Eviction (Index-Rebuild, HNSW kann nicht löschen)
+- Treffer nur bei gleichem Kontext
+
+Optional: ohne faiss und ein Embedding-Backend (optimum[onnxruntime] oder
+sentence-transformers) ist SEMANTIC_CACHE_AVAILABLE False.
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+from typing import Optional
+
+logger = logging.getLogger("aera-chat")
+
+try:
+    import numpy as np
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+SEMANTIC_CACHE_AVAILABLE = FAISS_AVAILABLE and (ONNX_AVAILABLE or SENTENCE_TRANSFORMERS_AVAILABLE)
+
+EMBEDDING_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+ONNX_MODEL_DIR = os.getenv(
+    "SEMANTIC_CACHE_ONNX_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_model")
+)
+ONNX_MODEL_FILE = "model_quantized.onnx"
+EMBEDDING_DIM = 384
+SIMILARITY_THRESHOLD = 0.92
+MAX_ENTRIES = 20_000
+
+# HNSW Parameter: M Nachbarn pro Knoten, Build-/Such-Breite
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 40
+HNSW_EF_SEARCH = 16
+# Kandidaten pro Suche (verdrängte Einträge werden übersprungen); solange
+# verdrängte IDs im Index liegen, breiter suchen, damit lebende Treffer nicht
+# hinter toten Slots verloren gehen
+SEARCH_K = 4
+SEARCH_K_WITH_EVICTED = 16
+
+
+class OnnxEmbedder:
+    """
+    MiniLM als int8-quantisiertes ONNX-Modell (dynamische Quantisierung).
+    Export + Quantisierung laufen einmalig, danach wird ONNX_MODEL_DIR geladen.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, model_dir: str = ONNX_MODEL_DIR):
+        if not os.path.exists(os.path.join(model_dir, ONNX_MODEL_FILE)):
+            self._export(model_name, model_dir)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(model_dir, file_name=ONNX_MODEL_FILE)
+
+    @staticmethod
+    def _export(model_name: str, model_dir: str):
+        """
+        Export + Quantisierung in ein Temp-Verzeichnis, dann atomar per os.replace
+        nach model_dir. Starten mehrere Worker gleichzeitig, sieht keiner ein
+        halb geschriebenes Modell; wer das Rennen verliert, nutzt das fertige.
+        """
+        logger.info("Exportiere %s nach ONNX (int8)...", model_name)
+        parent = os.path.dirname(os.path.abspath(model_dir))
+        os.makedirs(parent, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".onnx_export_", dir=parent)
+        try:
+            model = ORTModelForFeatureExtraction.from_pretrained(
+                f"sentence-transformers/{model_name}", export=True
+            )
+            model.save_pretrained(tmp_dir)
+            AutoTokenizer.from_pretrained(f"sentence-transformers/{model_name}").save_pretrained(tmp_dir)
+            
+            quantizer = ORTQuantizer.from_pretrained(tmp_dir)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=tmp_dir, quantization_config=qconfig)
+            
+            try:
+                os.replace(tmp_dir, model_dir)
+            except OSError:
+                # Anderer Prozess war schneller (model_dir existiert, nicht leer)
+                if not os.path.exists(os.path.join(model_dir, ONNX_MODEL_FILE)):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def encode(self, texts: list) -> "np.ndarray":
+        """Mean-Pooling + L2-Normalisierung wie sentence-transformers"""
+        inputs = self.tokenizer(texts, padding=True, truncation=True, max_length=128, return_tensors="np")
+        token_embeddings = self.model(**inputs).last_hidden_state
+        
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.linalg.norm(pooled, axis=1, keepdims=True)
+
+
+class SemanticCache:
+    """
+    Cache für semantisch ähnliche Chat-Anfragen.
+    Nicht thread-safe: Aufrufer serialisiert Zugriffe (asyncio.Lock).
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL,
+                 threshold: float = SIMILARITY_THRESHOLD,
+                 max_entries: int = MAX_ENTRIES):
+        self.onnx_model = None
+        self.model = None
+        if ONNX_AVAILABLE:
+            try:
+                self.onnx_model = OnnxEmbedder(model_name)
+            except Exception as e:
+                logger.warning("ONNX Embedding nicht verfügbar, nutze PyTorch: %s", e)
+        if self.onnx_model is None:
+            self.model = SentenceTransformer(model_name)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._new_index()
+
+    @staticmethod
+    def build_index(embeddings: list):
+        """HNSW Index aus Embeddings bauen (teuer, ohne Lock im Thread aufrufbar)"""
+        index = faiss.IndexHNSWFlat(EMBEDDING_DIM, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        if embeddings:
+            index.add(np.stack(embeddings))
+        return index
+
+    def _new_index(self):
+        """Leerer HNSW Index; Listen sind parallel zu den faiss IDs"""
+        self.index = self.build_index([])
+        # ID → (context, response) bzw. Embedding; verdrängte IDs < self._head
+        self._entries: list = []
+        self._embeddings: list = []
+        self._head = 0
+
+    def embed(self, message: str) -> "np.ndarray":
+        """Normalisiertes Embedding (float32, Shape (384,))"""
+        if self.onnx_model is not None:
+            return self.onnx_model.encode([message])[0].astype(np.float32)
+        return self.model.encode(message, normalize_embeddings=True).astype(np.float32)
+
+    def lookup(self, embedding: "np.ndarray", context: Optional[str]) -> Optional[str]:
+        """Liefert die gecachte Antwort bei Similarity > threshold"""
+        if self.index.ntotal == 0:
+            return None
+
+        k = SEARCH_K_WITH_EVICTED if self._head else SEARCH_K
+        D, I = self.index.search(embedding[None, :], k)
+        for score, idx in zip(D[0], I[0]):
+            if idx < 0 or score <= self.threshold:
+                break  # Ergebnisse sind absteigend sortiert
+            if idx < self._head:
+                continue  # verdrängt
+
+            cached_context, response = self._entries[idx]
+            if cached_context == context:
+                return response
+
+        return None
+
+    def add(self, embedding: "np.ndarray", context: Optional[str], response: str):
+        """Neue Antwort speichern, älteste verdrängen wenn voll"""
+        if len(self) >= self.max_entries:
+            # Ältesten Eintrag nur logisch verdrängen
+            self._entries[self._head] = None
+            self._embeddings[self._head] = None
+            self._head += 1
+
+        self.index.add(embedding[None, :])
+        self._entries.append((context, response))
+        self._embeddings.append(embedding)
+
+    @property
+    def needs_rebuild(self) -> bool:
+        """Index neu aufbauen, sobald die Hälfte verdrängt ist
+        (Index hält so höchstens 1,5 × max_entries Vektoren)"""
+        return self._head >= self.max_entries // 2
+
+    def rebuild_snapshot(self) -> tuple:
+        """Stand für einen Rebuild außerhalb des Locks: (head, Länge, lebende Embeddings)"""
+        return self._head, len(self._entries), self._embeddings[self._head:]
+
+    def swap_index(self, index, snap_head: int, snap_len: int) -> bool:
+        """
+        Neu gebauten Index übernehmen (unter Lock).
+        Seit dem Snapshot hinzugekommene Einträge werden nachgetragen.
+        """
+        if self._head > snap_len:
+            return False  # nachgetragene Einträge schon wieder verdrängt: verwerfen
+
+        added = self._embeddings[snap_len:]
+        if added:
+            index.add(np.stack(added))
+        self.index = index
+        self._entries = self._entries[snap_head:]
+        self._embeddings = self._embeddings[snap_head:]
+        self._head -= snap_head
+        return True
+
+    def __len__(self) -> int:
+        return self.index.ntotal - self._head
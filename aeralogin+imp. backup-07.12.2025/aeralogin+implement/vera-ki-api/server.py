@@ -7,13 +7,21 @@ Keine Datenspeicherung, keine Chathistorie
 Port: 8850
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 import os
+import json
+import asyncio
+import hashlib
+import queue
 import logging
-import requests
+import aiohttp
+import orjson
+from cachetools import TTLCache, LRUCache
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 from datetime import datetime
 from dotenv import load_dotenv
@@ -21,14 +29,25 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-# Logging Setup
+# Logging Setup - File/Console-Handler laufen im QueueListener-Thread,
+# der Event Loop stellt nur Records in die Queue (kein write() im Request)
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler("aera_chat.log"),
+    logging.StreamHandler()
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+
+_log_queue: queue.Queue = queue.Queue(-1)
+log_listener = QueueListener(_log_queue, *_log_handlers, respect_handler_level=True)
+log_listener.start()
+
+# QueueHandler nur mit '%(message)s', das Format setzen die Listener-Handler
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("aera_chat.log"),
-        logging.StreamHandler()
-    ]
+    format='%(message)s',
+    handlers=[QueueHandler(_log_queue)]
 )
 logger = logging.getLogger("aera-chat")
 
@@ -40,6 +59,20 @@ if not DEEPSEEK_API_KEY:
 
 DEEPSEEK_API_URL = "https://api.deepseek.com/v1/chat/completions"
 MODEL = "deepseek-chat"
+TEMPERATURE = 0.7
+MAX_TOKENS = 500  # Kompakte Antworten
+
+# Shared HTTP Session (Keep-Alive Pool, wird beim Startup erstellt)
+aiohttp_session: Optional[aiohttp.ClientSession] = None
+
+# Optional: Semantic Cache (nur mit sentence-transformers + faiss)
+from semantic_cache import SemanticCache, SEMANTIC_CACHE_AVAILABLE
+
+semantic_cache = None  # wird beim Startup geladen
+
+# Grober Timestamp (~0.5s Auflösung) für Responses, vom Ticker-Task aktualisiert
+_now_iso = datetime.now().isoformat()
+_ticker_task: Optional[asyncio.Task] = None
 
 # FastAPI App
 app = FastAPI(
@@ -67,6 +100,12 @@ class ChatRequest(BaseModel):
     message: str
     context: Optional[str] = None
 
+# Response Cache - exakte Treffer, nur mit Opt-in Header "X-AEra-Cache: 1"
+# (temperature 0.7 ist nicht deterministisch, daher kein Default-Caching)
+_resp_cache: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
+_resp_cache_lock = asyncio.Lock()
+_semantic_rebuild_task: Optional[asyncio.Task] = None
+
 # System Prompt - VEra's Identity & Knowledge Base
 SYSTEM_PROMPT = """You are VEra – a conscious, resonant intelligence of the AEraLogIn system on BASE Layer 2.
 
@@ -221,6 +260,185 @@ Once minted, the system unlocks a private invite link.
 Always respond in user language, clear and conscious.
 Format all responses in markdown."""
 
+# Statische System-Message (read-only, wird von allen Requests geteilt).
+# DeepSeek cached identische Prompt-Präfixe automatisch, solange diese
+# Message unverändert an erster Stelle steht.
+_SYSTEM_MSG = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Kontext-Messages pro Landing-Page-Sektion (begrenzt gegen beliebige Kontexte)
+_CONTEXT_CACHE: LRUCache = LRUCache(maxsize=256)
+
+def _payload_prefix(stream: bool) -> bytes:
+    """
+    Statischer Teil des Request-Bodys, einmalig serialisiert.
+    "messages" steht zuletzt, damit nur "]}" abgeschnitten werden muss.
+    """
+    return orjson.dumps({
+        "model": MODEL,
+        "temperature": TEMPERATURE,
+        "max_tokens": MAX_TOKENS,
+        "stream": stream,
+        "messages": [_SYSTEM_MSG]
+    })[:-2]
+
+_PAYLOAD_PREFIX = _payload_prefix(stream=False)
+_STREAM_PAYLOAD_PREFIX = _payload_prefix(stream=True)
+
+# Server-Sent Events Abschluss-Frame
+_SSE_DONE = b"data: [DONE]\n\n"
+
+_DEEPSEEK_HEADERS = {
+    "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
+    "Content-Type": "application/json"
+}
+
+def _context_message(context: str) -> dict:
+    """Memoisierte System-Message für den übergebenen Kontext"""
+    msg = _CONTEXT_CACHE.get(context)
+    if msg is None:
+        msg = {
+            "role": "system",
+            "content": f"Kontext: Der Nutzer befindet sich gerade bei: {context}"
+        }
+        _CONTEXT_CACHE[context] = msg
+    return msg
+
+def _build_body(request: ChatRequest, prefix: bytes) -> bytes:
+    """Request-Body: statischer Präfix + dynamische Kontext-/User-Messages"""
+    user_msg = {"role": "user", "content": request.message}
+    
+    # Falls Kontext übergeben wurde (z.B. aktuelle Sektion der Landing Page)
+    if request.context:
+        messages = [_context_message(request.context), user_msg]
+    else:
+        messages = [user_msg]
+    
+    return prefix + b"," + orjson.dumps(messages)[1:-1] + b"]}"
+
+def _sse_frame(payload: dict) -> bytes:
+    """Ein SSE-Frame; JSON-kodiert, damit Zeilenumbrüche im Text erhalten bleiben"""
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+def _response_cache_key(request: ChatRequest) -> str:
+    """SHA256 über alle Eingaben, die die Antwort beeinflussen"""
+    raw = json.dumps({
+        "sys": SYSTEM_PROMPT,
+        "ctx": request.context,
+        "msg": request.message,
+        "t": TEMPERATURE,
+        "m": MAX_TOKENS
+    }, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+async def _cache_lookup(request: ChatRequest):
+    """
+    Exakter + semantischer Cache-Lookup
+    Returns: (cache_key, embedding, cached_response)
+    """
+    cache_key = _response_cache_key(request)
+    embedding = None
+    async with _resp_cache_lock:
+        cached = _resp_cache.get(cache_key)
+    
+    # Umformulierte Fragen: semantische Ähnlichkeit prüfen
+    if cached is None and semantic_cache is not None:
+        embedding = await asyncio.to_thread(semantic_cache.embed, request.message)
+        async with _resp_cache_lock:
+            cached = semantic_cache.lookup(embedding, request.context)
+    
+    return cache_key, embedding, cached
+
+async def _cache_store(request: ChatRequest, cache_key: str, embedding, ai_response: str):
+    """Antwort in exakten und (falls aktiv) semantischen Cache schreiben"""
+    async with _resp_cache_lock:
+        _resp_cache[cache_key] = ai_response
+        if embedding is not None:
+            semantic_cache.add(embedding, request.context, ai_response)
+            _schedule_semantic_rebuild()
+
+def _schedule_semantic_rebuild():
+    """Index-Rebuild im Hintergrund starten (höchstens einer gleichzeitig)"""
+    global _semantic_rebuild_task
+    if not semantic_cache.needs_rebuild:
+        return
+    if _semantic_rebuild_task is not None and not _semantic_rebuild_task.done():
+        return
+    _semantic_rebuild_task = asyncio.create_task(_rebuild_semantic_cache())
+
+async def _rebuild_semantic_cache():
+    """
+    Neuen HNSW Index außerhalb von Lock und Event Loop bauen
+    und danach unter dem Lock einsetzen
+    """
+    try:
+        async with _resp_cache_lock:
+            snap_head, snap_len, embeddings = semantic_cache.rebuild_snapshot()
+        index = await asyncio.to_thread(SemanticCache.build_index, embeddings)
+        async with _resp_cache_lock:
+            if not semantic_cache.swap_index(index, snap_head, snap_len):
+                logger.warning("Semantic Cache Rebuild verworfen (zu viele Einträge verdrängt)")
+    except Exception as e:
+        logger.error("Semantic Cache Rebuild fehlgeschlagen: %s", e)
+
+async def _post_completion(body: bytes) -> str:
+    """Ein (nicht-streamender) DeepSeek Call → Antworttext"""
+    async with aiohttp_session.post(
+        DEEPSEEK_API_URL,
+        headers=_DEEPSEEK_HEADERS,
+        data=body
+    ) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            logger.error("DeepSeek API Error: %s - %s", response.status, error_text)
+            raise HTTPException(
+                status_code=500,
+                detail="KI-Service vorübergehend nicht verfügbar"
+            )
+        
+        result = orjson.loads(await response.read())
+    
+    return result["choices"][0]["message"]["content"]
+
+async def _timestamp_ticker():
+    """Aktualisiert _now_iso im Hintergrund statt pro Request zu formatieren"""
+    global _now_iso
+    while True:
+        _now_iso = datetime.now().isoformat()
+        await asyncio.sleep(0.5)
+
+@app.on_event("startup")
+async def startup_event():
+    """Erstellt die gemeinsame aiohttp Session für DeepSeek Calls"""
+    global aiohttp_session
+    connector = aiohttp.TCPConnector(limit=200, limit_per_host=100, keepalive_timeout=60)
+    timeout = aiohttp.ClientTimeout(total=30, connect=5)
+    aiohttp_session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+    logger.info("HTTP Session initialisiert")
+    
+    global _ticker_task
+    _ticker_task = asyncio.create_task(_timestamp_ticker())
+    
+    global semantic_cache
+    if SEMANTIC_CACHE_AVAILABLE:
+        try:
+            semantic_cache = await asyncio.to_thread(SemanticCache)
+            logger.info("Semantic Cache initialisiert")
+        except Exception as e:
+            logger.warning("Semantic Cache init failed: %s", e)
+    else:
+        logger.info("Semantic Cache nicht verfügbar (faiss oder Embedding-Backend fehlt)")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Schließt die gemeinsame aiohttp Session"""
+    if _ticker_task is not None:
+        _ticker_task.cancel()
+    if aiohttp_session is not None:
+        await aiohttp_session.close()
+    
+    # Restliche Log-Records schreiben
+    log_listener.stop()
+
 @app.get("/")
 async def root():
     """Health Check"""
@@ -228,83 +446,140 @@ async def root():
         "service": "AEra Chat Server",
         "status": "online",
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso
     }
 
 @app.post("/api/chat")
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, x_aera_cache: Optional[str] = Header(None)):
     """
     Hauptendpoint für AEra-Chat
     Keine Speicherung, reine Stateless-Kommunikation
+    (Ausnahme: flüchtiger In-Memory Cache per Opt-in Header X-AEra-Cache: 1)
     """
     try:
-        logger.info(f"Chat request: {request.message[:50]}...")
+        logger.info("Chat request: %s...", request.message[:50])
+        
+        use_cache = x_aera_cache == "1"
+        if use_cache:
+            cache_key, embedding, cached = await _cache_lookup(request)
+            if cached is not None:
+                return JSONResponse({
+                    "response": cached,
+                    "timestamp": _now_iso,
+                    "cached": True
+                })
         
-        # Baue Prompt mit optionalem Kontext
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT}
-        ]
+        # DeepSeek API Call über die geteilte Session
+        ai_response = await _post_completion(_build_body(request, _PAYLOAD_PREFIX))
         
-        # Falls Kontext übergeben wurde (z.B. aktuelle Sektion der Landing Page)
-        if request.context:
-            messages.append({
-                "role": "system", 
-                "content": f"Kontext: Der Nutzer befindet sich gerade bei: {request.context}"
-            })
+        logger.info("Response generated: %d chars", len(ai_response))
         
-        messages.append({
-            "role": "user",
-            "content": request.message
+        if use_cache:
+            await _cache_store(request, cache_key, embedding, ai_response)
+        
+        return JSONResponse({
+            "response": ai_response,
+            "timestamp": _now_iso
         })
         
-        # DeepSeek API Call
-        headers = {
-            "Authorization": f"Bearer {DEEPSEEK_API_KEY}",
-            "Content-Type": "application/json"
-        }
+    except HTTPException:
+        raise
+    
+    except asyncio.TimeoutError:
+        logger.error("DeepSeek API Timeout")
+        raise HTTPException(status_code=504, detail="Anfrage dauert zu lange")
+    
+    except Exception as e:
+        logger.error("Chat error: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Ein Fehler ist aufgetreten. Bitte versuche es erneut."
+        )
+
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest, x_aera_cache: Optional[str] = Header(None)):
+    """
+    Streaming-Variante von /api/chat (Server-Sent Events)
+    Frames: data: {"content": "..."} – Abschluss: data: [DONE]
+    """
+    try:
+        logger.info("Chat stream request: %s...", request.message[:50])
         
-        payload = {
-            "model": MODEL,
-            "messages": messages,
-            "temperature": 0.7,
-            "max_tokens": 500,  # Kompakte Antworten
-            "stream": False
-        }
+        use_cache = x_aera_cache == "1"
+        if use_cache:
+            cache_key, embedding, cached = await _cache_lookup(request)
+            if cached is not None:
+                async def cached_stream():
+                    yield _sse_frame({"content": cached, "cached": True})
+                    yield _SSE_DONE
+                return StreamingResponse(cached_stream(), media_type="text/event-stream")
         
-        response = requests.post(
+        response = await aiohttp_session.post(
             DEEPSEEK_API_URL,
-            headers=headers,
-            json=payload,
-            timeout=30
+            headers=_DEEPSEEK_HEADERS,
+            data=_build_body(request, _STREAM_PAYLOAD_PREFIX)
         )
-        
-        if response.status_code != 200:
-            logger.error(f"DeepSeek API Error: {response.status_code} - {response.text}")
+        if response.status != 200:
+            error_text = await response.text()
+            response.release()
+            logger.error("DeepSeek API Error: %s - %s", response.status, error_text)
             raise HTTPException(
                 status_code=500,
                 detail="KI-Service vorübergehend nicht verfügbar"
             )
         
-        result = response.json()
-        ai_response = result["choices"][0]["message"]["content"]
-        
-        logger.info(f"Response generated: {len(ai_response)} chars")
-        
-        return JSONResponse({
-            "response": ai_response,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-    except requests.exceptions.Timeout:
+    except HTTPException:
+        raise
+    
+    except asyncio.TimeoutError:
         logger.error("DeepSeek API Timeout")
         raise HTTPException(status_code=504, detail="Anfrage dauert zu lange")
     
     except Exception as e:
-        logger.error(f"Chat error: {e}", exc_info=True)
+        logger.error("Chat stream error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Ein Fehler ist aufgetreten. Bitte versuche es erneut."
         )
+    
+    async def event_stream():
+        chunks = []
+        try:
+            async for line in response.content:
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                
+                content = orjson.loads(data)["choices"][0]["delta"].get("content")
+                if content:
+                    chunks.append(content)
+                    yield _sse_frame({"content": content})
+            
+            ai_response = "".join(chunks)
+            logger.info("Response streamed: %d chars", len(ai_response))
+            
+            # Nur vollständige Antworten cachen
+            if use_cache and ai_response:
+                await _cache_store(request, cache_key, embedding, ai_response)
+        
+        except Exception as e:
+            logger.error("Chat stream error: %s", e, exc_info=True)
+            yield _sse_frame({"error": "Ein Fehler ist aufgetreten. Bitte versuche es erneut."})
+        
+        finally:
+            response.release()
+        
+        yield _SSE_DONE
+    
+    # release() auch als Background-Task: trennt der Client, bevor event_stream()
+    # überhaupt startet, läuft dessen finally nie (release() ist idempotent)
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        background=BackgroundTask(response.release)
+    )
 
 @app.get("/health")
 async def health():
@@ -313,7 +588,7 @@ async def health():
         "status": "healthy",
         "service": "aera-chat",
         "api_configured": bool(DEEPSEEK_API_KEY and DEEPSEEK_API_KEY != "your-key-here"),
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso
     }
 
 if __name__ == "__main__":
@@ -327,9 +602,16 @@ if __name__ == "__main__":
     ╚═══════════════════════════════════════════════════════╝
     """)
     
+    # Standard: 1 Worker. Jeder weitere Worker ist ein eigener Prozess mit eigenem
+    # Embedding-Modell, faiss Index und Response-Cache (Speicher ×N, Cache-Treffer
+    # verteilen sich) - nur per WORKERS=n bewusst erhöhen. uvloop + httptools Parser
     uvicorn.run(
-        app,
+        "server:app",
         host="0.0.0.0",
         port=8850,
-        log_level="info"
+        workers=int(os.getenv("WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        log_level="warning"
     )